@@ -0,0 +1,225 @@
+"""Synthetic corpus generator for benchmarks.
+
+Seeds Article / BDMatch / IntMatch with realistic-looking rows: Bangladesh
+themed headlines, log-normally distributed body sizes, a source mix skewed
+towards Indian outlets (like production) and summary_json in the shape
+ingestion writes.
+
+    python bench/corpus.py --rows 10000 --db /tmp/sims_bench_10k.db
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from dedup import canonical_url  # noqa: E402
+from sources import GROUP_BANGLADESHI, GROUP_INDIAN, GROUP_INTERNATIONAL, REGISTRY  # noqa: E402
+
+SIZES = {'1k': 1_000, '10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+# Sampling pools: the outlets the Exa query covers (see sources.py)
+INDIAN_SOURCES = [s.domain for s in REGISTRY.sources(GROUP_INDIAN)]
+BD_SOURCES = [s.domain for s in REGISTRY.sources(GROUP_BANGLADESHI) if s.exa]
+INTL_SOURCES = [s.domain for s in REGISTRY.sources(GROUP_INTERNATIONAL) if s.exa]
+# (bucket, weight); roughly the mix in the production database
+SOURCE_MIX = [('indian', 0.50), ('bd', 0.13), ('intl', 0.04), ('other', 0.33)]
+
+SUBJECTS = ["Bangladesh", "Dhaka", "Muhammad Yunus", "Sheikh Hasina", "BNP", "Awami League", "Chittagong",
+            "Rohingya refugees", "Teesta water talks", "BSF", "Border Guard Bangladesh", "Khulna", "Sylhet",
+            "Indian High Commission", "Bangladesh Army", "Jamaat-e-Islami", "Padma bridge", "Hindu minorities"]
+ACTIONS = ["rejects", "welcomes", "warns over", "signs pact on", "protests against", "calls for talks on",
+           "raises concern about", "cracks down on", "reviews", "announces probe into", "backs"]
+OBJECTS = ["border fencing", "trade curbs", "power imports", "visa restrictions", "river water sharing",
+           "election roadmap", "minority attacks", "garment exports", "rail connectivity", "extradition request",
+           "fishing ban", "cross-border smuggling", "energy deal", "interim government"]
+FILLER = ["Officials said the matter would be discussed at the next bilateral meeting.",
+          "The ministry of external affairs did not respond to requests for comment.",
+          "Analysts say the move could reshape ties between New Delhi and Dhaka.",
+          "Protesters gathered outside the press club on Saturday.",
+          "The decision follows weeks of negotiations between the two neighbours.",
+          "Trade through the Petrapole-Benapole land port was briefly disrupted.",
+          "Police said several people had been detained for questioning.",
+          "The interim administration has promised elections within the coming year.",
+          "Opposition leaders criticised the government's handling of the issue.",
+          "Exporters warned that delays at the border were raising costs.",
+          "Read more: https://example.com/related-story?utm_source=feed",
+          "Also see https://www.example.org/analysis/south-asia for background."]
+CATEGORIES = ["Politics", "Economy", "Crime", "Environment", "Health", "Technology", "Diplomacy", "Sports",
+              "Culture", "Other", "General"]
+SENTIMENTS = [("Negative", 0.45), ("Neutral", 0.35), ("Positive", 0.15), ("Cautious", 0.05)]
+FACT_CHECKS = [("Unverified", 0.6), ("Verified", 0.4)]
+AUTHORS = ["Staff Reporter", "PTI", "Reuters", "Saikat Kumar Bose", "Scroll Staff", "Agencies", None]
+
+
+def _weighted(rng, pairs):
+    return rng.choices([p[0] for p in pairs], weights=[p[1] for p in pairs])[0]
+
+
+def pick_source(rng):
+    bucket = _weighted(rng, SOURCE_MIX)
+    if bucket == 'indian':
+        return bucket, rng.choice(INDIAN_SOURCES)
+    if bucket == 'bd':
+        return bucket, rng.choice(BD_SOURCES)
+    if bucket == 'intl':
+        return bucket, rng.choice(INTL_SOURCES)
+    return bucket, 'Other'
+
+
+def make_title(rng):
+    return f"{rng.choice(SUBJECTS)} {rng.choice(ACTIONS)} {rng.choice(OBJECTS)}"
+
+
+def make_text(rng, title, median_chars):
+    # Log-normal body size; ~80% of stories mention Bangladesh explicitly
+    target = int(min(median_chars * rng.lognormvariate(0, 0.6), median_chars * 15))
+    parts = [title + '.']
+    if rng.random() < 0.8:
+        parts.append(f"The development was closely watched in Bangladesh, where {rng.choice(SUBJECTS)} "
+                     f"{rng.choice(ACTIONS)} {rng.choice(OBJECTS)}.")
+    size = sum(len(p) for p in parts)
+    while size < target:
+        sentence = rng.choice(FILLER) if rng.random() < 0.7 else f"{make_title(rng)}."
+        parts.append(sentence)
+        size += len(sentence) + 1
+    return ' '.join(parts)
+
+
+def make_url(domain, idx):
+    host = domain if domain != 'Other' else f"news{idx % 97}.example.com"
+    return f"https://www.{host}/news/{idx}-bangladesh-story"
+
+
+def make_matches(rng, pool):
+    return [{'title': make_title(rng), 'source': rng.choice(pool), 'url': f"https://{rng.choice(pool)}/m/{rng.randrange(10**9)}"}
+            for _ in range(rng.randint(1, 3))]
+
+
+def make_article_row(rng, idx, now, median_chars=2500):
+    _, source = pick_source(rng)
+    title = make_title(rng)
+    text = make_text(rng, title, median_chars)
+    url = make_url(source, idx)
+    sentiment = _weighted(rng, SENTIMENTS)
+    fact_check = _weighted(rng, FACT_CHECKS)
+    category = rng.choice(CATEGORIES)
+    bd_matches = make_matches(rng, BD_SOURCES) if rng.random() < 0.3 else []
+    intl_matches = make_matches(rng, INTL_SOURCES) if rng.random() < 0.2 else []
+    published_at = now - datetime.timedelta(seconds=rng.randrange(365 * 86400))
+    links = list({f"https://{rng.choice(INDIAN_SOURCES + BD_SOURCES)}/story/{rng.randrange(10**6)}" for _ in range(rng.randint(0, 8))})
+    row = {
+        'url': url,
+        'canonical_url': canonical_url(url),
+        'title': title,
+        'published_at': published_at,
+        'author': rng.choice(AUTHORS),
+        'source': source,
+        'source_group': REGISTRY.group_of(source),
+        'sentiment': sentiment,
+        'fact_check': fact_check,
+        'bd_summary': 'Covered' if bd_matches else 'Not covered',
+        'int_summary': 'Covered' if intl_matches else 'Not covered',
+        'image': f"https://img.example.com/{idx}.jpg",
+        'favicon': f"https://{source if source != 'Other' else 'example.com'}/favicon.ico",
+        'score': round(rng.random(), 4),
+        'extras': json.dumps({'links': links}),
+        'full_text': text,
+        'summary_json': json.dumps({
+            'source': source,
+            'sentiment': sentiment,
+            'fact_check': fact_check,
+            'category': category,
+            'comparison': {
+                'bangladeshi_media': 'Covered' if bd_matches else 'Not covered',
+                'international_media': 'Covered' if intl_matches else 'Not covered'
+            },
+            'bangladeshi_matches': bd_matches,
+            'international_matches': intl_matches
+        }),
+        'updated_at': published_at + datetime.timedelta(minutes=rng.randrange(600)),
+    }
+    return row, bd_matches, intl_matches
+
+
+def seed(db, rows, seed_value=42, batch_size=5000, median_chars=2500, progress=True):
+    # Must run inside an app context bound to the target database
+    from app import Article, BDMatch, IntMatch
+    rng = random.Random(seed_value)
+    now = datetime.datetime(2026, 1, 1)
+    start_id = (db.session.query(db.func.max(Article.id)).scalar() or 0) + 1
+    started = time.perf_counter()
+    for batch_start in range(0, rows, batch_size):
+        articles, bd, intl = [], [], []
+        for i in range(batch_start, min(rows, batch_start + batch_size)):
+            article_id = start_id + i
+            row, bd_matches, intl_matches = make_article_row(rng, article_id, now, median_chars)
+            row['id'] = article_id
+            articles.append(row)
+            bd.extend({'article_id': article_id, **m} for m in bd_matches)
+            intl.extend({'article_id': article_id, **m} for m in intl_matches)
+        db.session.execute(Article.__table__.insert(), articles)
+        if bd:
+            db.session.execute(BDMatch.__table__.insert(), bd)
+        if intl:
+            db.session.execute(IntMatch.__table__.insert(), intl)
+        db.session.commit()
+        if progress:
+            done = min(rows, batch_start + batch_size)
+            print(f"  seeded {done}/{rows} articles ({time.perf_counter() - started:.1f}s)", end='\r')
+    if progress:
+        print()
+
+
+def build_app(db_path, **config):
+    from app import create_app
+    return create_app({
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{os.path.abspath(db_path)}',
+        'SCHEDULER_ENABLED': False,
+        'STREAM_ENABLED': False,
+        'EXA_ARCHIVE_DIR': os.path.abspath(db_path) + '.exa_archive',
+        # FakeExa's image URLs point nowhere
+        'MEDIA_ENABLED': False,
+        **config
+    })
+
+
+def create_corpus(db_path, rows, seed_value=42, median_chars=2500, force=False):
+    from app import db
+    if os.path.exists(db_path):
+        if not force:
+            return build_app(db_path)
+        os.remove(db_path)
+    app = build_app(db_path)
+    with app.app_context():
+        db.create_all()
+        seed(db, rows, seed_value=seed_value, median_chars=median_chars)
+    return app
+
+
+def parse_rows(value):
+    return SIZES.get(value.lower()) or int(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Seed a synthetic SIMS Analytics corpus.')
+    parser.add_argument('--rows', default='10k', help='1k, 10k, 100k, 1m or an integer')
+    parser.add_argument('--db', required=True, help='SQLite file to create')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--median-chars', type=int, default=2500, help='median full_text length')
+    parser.add_argument('--force', action='store_true', help='replace an existing file')
+    args = parser.parse_args()
+    rows = parse_rows(args.rows)
+    started = time.perf_counter()
+    create_corpus(args.db, rows, seed_value=args.seed, median_chars=args.median_chars, force=args.force)
+    print(f"{args.db}: {rows} articles in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
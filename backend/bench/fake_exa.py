@@ -0,0 +1,94 @@
+"""Offline stand-in for exa_py.Exa.
+
+Returns canned search_and_contents results shaped like the real client's:
+result objects with title/url/published_date/author/text/summary/image/
+favicon/score/extras. Summaries come as JSON strings alternating between
+camelCase and snake_case keys, with a few missing or malformed ones, so
+every branch of run_exa_ingestion's normalization gets exercised.
+
+    from bench.fake_exa import FakeExa
+    run_exa_ingestion(exa=FakeExa(num_results=100))
+"""
+import datetime
+import json
+import random
+import time
+from types import SimpleNamespace
+
+from bench.corpus import BD_SOURCES, INTL_SOURCES, make_matches, make_text, make_title, pick_source
+
+
+class FakeExa:
+    def __init__(self, num_results=100, seed=7, latency=0.0, url_prefix='https://fake-exa', median_chars=2500):
+        self.num_results = num_results
+        self.seed = seed
+        self.latency = latency
+        self.url_prefix = url_prefix
+        self.median_chars = median_chars
+        self.calls = 0
+
+    def _summary(self, rng, source, idx):
+        roll = rng.random()
+        if roll < 0.03:
+            return None
+        if roll < 0.05:
+            return '{"not valid json'
+        bd_matches = make_matches(rng, BD_SOURCES) if rng.random() < 0.3 else []
+        intl_matches = make_matches(rng, INTL_SOURCES) if rng.random() < 0.2 else []
+        sentiment = rng.choice(['positive', 'Negative', 'neutral', None])
+        status = rng.choice(['verified', 'unverified'])
+        category = rng.choice(['Politics', 'Economy', 'Diplomacy', 'General', None])
+        if idx % 2:
+            summary = {
+                'source': source,
+                'sentiment': sentiment,
+                'category': category,
+                'factCheck': {'status': status, 'sources': [], 'similarFactChecks': []},
+                'comparison': {'bangladeshiMedia': 'Covered' if bd_matches else 'Not covered',
+                               'internationalMedia': 'Covered' if intl_matches else 'Not covered'},
+                'bangladeshiMatches': bd_matches,
+                'internationalMatches': intl_matches,
+            }
+        else:
+            summary = {
+                'source': source,
+                'sentiment': sentiment,
+                'category': category,
+                'fact_check': status,
+                'comparison': {'bangladeshi_media': 'Covered' if bd_matches else 'Not covered',
+                               'international_media': 'Covered' if intl_matches else 'Not covered'},
+                'bangladeshi_matches': bd_matches,
+                'international_matches': intl_matches,
+            }
+        return json.dumps(summary)
+
+    def make_results(self):
+        rng = random.Random(self.seed)
+        now = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+        results = []
+        for idx in range(self.num_results):
+            _, source = pick_source(rng)
+            title = make_title(rng)
+            text = make_text(rng, title, self.median_chars)
+            host = source if source != 'Other' else f'news{idx % 97}.example.com'
+            published = now - datetime.timedelta(seconds=rng.randrange(30 * 86400))
+            results.append(SimpleNamespace(
+                id=f'{self.url_prefix}/{idx}',
+                title=title,
+                url=f'{self.url_prefix}/{host}/{idx}',
+                published_date=published.isoformat().replace('+00:00', 'Z') if rng.random() < 0.95 else None,
+                author=None if rng.random() < 0.4 else 'Staff Reporter',
+                text=text,
+                summary=self._summary(rng, source, idx),
+                image=f'https://img.example.com/fake/{idx}.jpg',
+                favicon=f'https://{host}/favicon.ico',
+                score=round(rng.random(), 4),
+                extras={'links': []} if rng.random() < 0.5 else {},
+            ))
+        return results
+
+    def search_and_contents(self, query, **kwargs):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return SimpleNamespace(results=self.make_results(), autoprompt_string=query)
@@ -0,0 +1,70 @@
+"""Cold-start check: how long does `import app` take in a fresh interpreter?
+
+Uses CPython's -X importtime, prints the heaviest top-level imports and exits
+non-zero when the total exceeds the budget, so it can gate CI or a Docker
+build step:
+
+    python bench/import_time.py --budget-ms 1000
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def measure(module='app'):
+    env = dict(os.environ, SCHEDULER_ENABLED='0', NLP_PRELOAD='0')
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - t0) * 1000
+    if proc.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    # Entries are printed children-first; a name indented by one space is a
+    # top-level import, three spaces is one of its direct imports.
+    children = []
+    direct_imports = []
+    total_ms = None
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = len(name) - len(name.lstrip())
+        name = name.strip()
+        cumulative = int(cumulative_us) / 1000
+        if depth == 3:
+            children.append((cumulative, name))
+        elif depth == 1:
+            if name == module:
+                total_ms = cumulative
+                direct_imports = children
+            children = []
+    direct_imports.sort(reverse=True)
+    return total_ms, wall_ms, direct_imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--module', default='app')
+    parser.add_argument('--budget-ms', type=float, default=1000.0)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    total_ms, wall_ms, direct_imports = measure(args.module)
+    print(f"import {args.module}: {total_ms:.1f} ms (process wall time {wall_ms:.1f} ms)")
+    for cumulative, name in direct_imports[:args.top]:
+        print(f"  {cumulative:9.1f} ms  {name}")
+    if total_ms is not None and total_ms > args.budget_ms:
+        print(f"FAIL: over budget of {args.budget_ms:.0f} ms")
+        return 1
+    print(f"OK: within budget of {args.budget_ms:.0f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,335 @@
+"""HTTP load test: concurrent frontend traffic against a running server.
+
+Starts the backend as a separate process on a synthetic corpus (or targets
+--url), then replays a weighted mix of the calls the frontend makes from
+--concurrency client threads for --duration seconds: /api/dashboard with
+filter permutations, /api/articles paging and search, /api/articles/<id>
+and /api/indian-sources. With --ingest another process runs ingestion
+against the offline FakeExa in a loop meanwhile. Reports throughput and
+p50/p95/p99 per endpoint, and with --compare fails (exit 1) when a
+percentile grows, or throughput drops, by more than --threshold:
+
+    python bench/load_test.py --size 10k --duration 30 --out bench/load.json
+    python bench/load_test.py --size 10k --duration 30 --ingest --compare bench/load.json
+
+Run the same size, duration and concurrency for the baseline and the
+comparison. /api/dashboard needs the spaCy model (SPACY_MODEL).
+"""
+import argparse
+import datetime
+import http.client
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from bench.corpus import CATEGORIES, INDIAN_SOURCES, SENTIMENTS, build_app, create_corpus, parse_rows  # noqa: E402
+from bench.run_bench import git_revision  # noqa: E402
+
+SEARCHES = ['Teesta', 'extradition', 'border', 'election', 'Yunus', 'garment']
+RANGES = [7, 30, 90, 365]  # dashboard date filters, days back from today
+
+# endpoint -> relative weight in the mix (roughly what the frontend pages call)
+MIX = {
+    'dashboard': 30,
+    'articles': 25,
+    'articles_search': 10,
+    'article_detail': 25,
+    'indian_sources': 10,
+}
+METRICS = ('p50_ms', 'p95_ms', 'p99_ms')
+
+
+def make_request(rng, endpoint, max_id, total):
+    if endpoint == 'dashboard':
+        params = {}
+        if rng.random() < 0.5:
+            params['source'] = rng.choice(INDIAN_SOURCES)
+        if rng.random() < 0.3:
+            params['category'] = rng.choice(CATEGORIES)
+        if rng.random() < 0.4:
+            today = datetime.date.today()
+            params['start'] = (today - datetime.timedelta(days=rng.choice(RANGES))).isoformat()
+            if rng.random() < 0.5:
+                params['end'] = today.isoformat()
+        return '/api/dashboard' + ('?' + urlencode(params) if params else '')
+    if endpoint == 'articles':
+        limit = rng.choice([10, 20, 50])
+        # Most readers stay on the first pages
+        page = min(int(rng.expovariate(0.5)), max(0, total // limit - 1))
+        params = {'limit': limit, 'offset': page * limit}
+        if rng.random() < 0.3:
+            params['source'] = rng.choice(INDIAN_SOURCES)
+        if rng.random() < 0.2:
+            params['sentiment'] = rng.choice(SENTIMENTS)[0]
+        return '/api/articles?' + urlencode(params)
+    if endpoint == 'articles_search':
+        return '/api/articles?' + urlencode({'search': rng.choice(SEARCHES), 'limit': 20})
+    if endpoint == 'article_detail':
+        return f'/api/articles/{rng.randint(1, max_id)}'
+    return '/api/indian-sources'
+
+
+def percentile(ordered, q):
+    # Nearest-rank percentile of a sorted list
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered) + 0.5)) - 1))]
+
+
+def summarize(samples_ms, errors, seconds):
+    ordered = sorted(samples_ms)
+    result = {'n': len(ordered), 'errors': errors, 'rps': round(len(ordered) / seconds, 2) if seconds else 0.0}
+    if ordered:
+        result.update({
+            'p50_ms': round(percentile(ordered, 0.50), 3),
+            'p95_ms': round(percentile(ordered, 0.95), 3),
+            'p99_ms': round(percentile(ordered, 0.99), 3),
+            'max_ms': round(ordered[-1], 3),
+        })
+    return result
+
+
+class Client:
+    # One keep-alive connection per client thread
+    def __init__(self, base_url, timeout):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.timeout = timeout
+        self.conn = None
+
+    def get(self, path):
+        for attempt in range(2):
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self.conn.request('GET', path)
+                response = self.conn.getresponse()
+                response.read()
+                return response.status
+            except (http.client.HTTPException, OSError):
+                self.conn.close()
+                self.conn = None
+                if attempt:
+                    raise
+
+
+def run_load(base_url, duration, concurrency, seed, max_id, total, timeout=60.0):
+    endpoints = list(MIX)
+    weights = [MIX[e] for e in endpoints]
+    samples = {e: [] for e in endpoints}
+    errors = {e: 0 for e in endpoints}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(n):
+        rng = random.Random(seed * 1000 + n)
+        client = Client(base_url, timeout)
+        local = {e: [] for e in endpoints}
+        failed = {e: 0 for e in endpoints}
+        while time.perf_counter() < deadline:
+            endpoint = rng.choices(endpoints, weights)[0]
+            path = make_request(rng, endpoint, max_id, total)
+            started = time.perf_counter()
+            try:
+                status = client.get(path)
+            except (http.client.HTTPException, OSError):
+                status = None
+            elapsed = (time.perf_counter() - started) * 1000
+            if status in (200, 404):
+                local[endpoint].append(elapsed)
+            else:
+                failed[endpoint] += 1
+        with lock:
+            for e in endpoints:
+                samples[e].extend(local[e])
+                errors[e] += failed[e]
+
+    threads = [threading.Thread(target=worker, args=(n,), daemon=True) for n in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    results = {e: summarize(samples[e], errors[e], elapsed) for e in endpoints}
+    results['all'] = summarize([s for e in endpoints for s in samples[e]], sum(errors.values()), elapsed)
+    return results
+
+
+def wait_for_server(base_url, timeout):
+    client = Client(base_url, 5)
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if client.get('/api/health') == 200:
+                return True
+        except (http.client.HTTPException, OSError):
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def serve(db_path, port):
+    # --serve: the backend on a threaded WSGI server, as the load target
+    import logging
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    WSGIRequestHandler.protocol_version = 'HTTP/1.1'  # keep-alive, like a browser
+    app = build_app(db_path)
+    make_server('127.0.0.1', port, app, threaded=True).serve_forever()
+
+
+def ingest_loop(db_path, interval, num_results):
+    # --ingest-worker: a new batch of fake Exa results every interval
+    from app import run_exa_ingestion
+    from bench.fake_exa import FakeExa
+    app = build_app(db_path)
+    n = 0
+    while True:
+        n += 1
+        with app.app_context():
+            run_exa_ingestion(exa=FakeExa(num_results=num_results, seed=1000 + n,
+                                          url_prefix=f'https://fake-exa/load-{os.getpid()}-{n}'))
+        time.sleep(interval)
+
+
+def compare_results(baseline, current, threshold):
+    # Returns a list of (endpoint, metric, old, new, ratio) regressions
+    regressions = []
+    for endpoint, stats in current.get('results', {}).items():
+        old = baseline.get('results', {}).get(endpoint)
+        if not old:
+            continue
+        for metric in METRICS + ('rps',):
+            if not old.get(metric) or stats.get(metric) is None:
+                continue
+            # Latencies regress upwards, throughput downwards
+            ratio = stats[metric] / old[metric]
+            worse = ratio > 1 + threshold if metric != 'rps' else ratio < 1 / (1 + threshold)
+            marker = '  REGRESSION' if worse else ''
+            if worse:
+                regressions.append((endpoint, metric, old[metric], stats[metric], ratio))
+            print(f"  {endpoint:<16} {metric:<7} {old[metric]:>10.2f} -> {stats[metric]:>10.2f} ({ratio:5.2f}x){marker}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the HTTP API with a frontend-like request mix.')
+    parser.add_argument('--size', default='10k', help='corpus size: 1k,10k,100k,1m or an integer')
+    parser.add_argument('--data-dir', default=os.path.join(BACKEND_DIR, 'instance', 'bench'))
+    parser.add_argument('--fresh', action='store_true', help='rebuild the cached corpus')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--url', default=None, help='target this running server instead of starting one')
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--duration', type=float, default=30, help='seconds of load')
+    parser.add_argument('--warmup', type=float, default=5, help='seconds of load before measuring')
+    parser.add_argument('--concurrency', type=int, default=8, help='client threads')
+    parser.add_argument('--ingest', action='store_true', help='run ingestion against FakeExa meanwhile')
+    parser.add_argument('--ingest-interval', type=float, default=5, help='seconds between ingestion runs')
+    parser.add_argument('--ingest-results', type=int, default=100, help='items per fake Exa response')
+    parser.add_argument('--out', default=None, help='write results JSON here')
+    parser.add_argument('--compare', default=None, help='baseline results JSON')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed regression ratio vs baseline')
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--ingest-worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--db', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.db, args.port)
+        return 0
+    if args.ingest_worker:
+        ingest_loop(args.db, args.ingest_interval, args.ingest_results)
+        return 0
+
+    rows = parse_rows(args.size)
+    db_path = os.path.join(args.data_dir, f'corpus_{rows}_{args.seed}.db')
+    os.makedirs(args.data_dir, exist_ok=True)
+    processes = []
+    try:
+        if args.url:
+            base_url = args.url.rstrip('/')
+        else:
+            started = time.perf_counter()
+            create_corpus(db_path, rows, seed_value=args.seed, force=args.fresh)
+            print(f"Corpus {db_path} ready in {time.perf_counter() - started:.1f}s")
+            base_url = f'http://127.0.0.1:{args.port}'
+            processes.append(subprocess.Popen([sys.executable, __file__, '--serve', '--db', db_path,
+                                               '--port', str(args.port)], cwd=BACKEND_DIR))
+        if not wait_for_server(base_url, 120):
+            print(f"Server at {base_url} did not become healthy")
+            return 2
+        if args.url:
+            max_id = total = rows
+        else:
+            from app import Article, db
+            app = build_app(db_path)
+            with app.app_context():
+                max_id = db.session.query(db.func.max(Article.id)).scalar() or 1
+                total = db.session.query(db.func.count(Article.id)).scalar()
+        if args.ingest:
+            processes.append(subprocess.Popen([sys.executable, __file__, '--ingest-worker', '--db', db_path,
+                                               '--ingest-interval', str(args.ingest_interval),
+                                               '--ingest-results', str(args.ingest_results)],
+                                              cwd=BACKEND_DIR, stdout=subprocess.DEVNULL))
+        if args.warmup:
+            print(f"Warming up for {args.warmup:.0f}s...")
+            run_load(base_url, args.warmup, args.concurrency, args.seed + 1, max_id, total)
+        print(f"Measuring {args.concurrency} clients for {args.duration:.0f}s against {base_url}"
+              f"{' with ingestion' if args.ingest else ''}...")
+        results = run_load(base_url, args.duration, args.concurrency, args.seed, max_id, total)
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+
+    print(f"  {'endpoint':<16} {'requests':>8} {'errors':>6} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for endpoint, stats in results.items():
+        print(f"  {endpoint:<16} {stats['n']:>8} {stats['errors']:>6} {stats['rps']:>8.1f} "
+              f"{stats.get('p50_ms', 0):>9.2f} {stats.get('p95_ms', 0):>9.2f} {stats.get('p99_ms', 0):>9.2f}")
+    report = {
+        'meta': {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'git': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'size': args.size,
+            'duration': args.duration,
+            'concurrency': args.concurrency,
+            'ingest': args.ingest,
+        },
+        'results': results
+    }
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.out}")
+    status = 0
+    if results['all']['errors']:
+        print(f"WARNING: {results['all']['errors']} request(s) failed")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"Compared with {args.compare} (threshold {args.threshold:.0%}):")
+        regressions = compare_results(baseline, report, args.threshold)
+        if regressions:
+            print(f"FAIL: {len(regressions)} metric(s) regressed")
+            status = 1
+        else:
+            print("OK: no regressions")
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""Repeatable benchmarks for the backend hot paths.
+
+Seeds (or reuses) a synthetic corpus per size, then times ingestion against
+the offline FakeExa and the read endpoints in-process through the Flask test
+client, so results measure server work only. Results are written as JSON and
+can be compared against a previous run:
+
+    python bench/run_bench.py --sizes 1k,10k --out bench/results.json
+    python bench/run_bench.py --sizes 1k --compare bench/results.json --threshold 0.25
+
+Corpora are cached in --data-dir and reused between runs (--fresh to rebuild).
+/api/dashboard needs the spaCy model (SPACY_MODEL or --spacy-model).
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from bench.corpus import create_corpus, parse_rows  # noqa: E402
+from bench.fake_exa import FakeExa  # noqa: E402
+
+
+def summarize(samples_ms, queries=None):
+    ordered = sorted(samples_ms)
+    result = {
+        'n': len(ordered),
+        'min_ms': round(ordered[0], 3),
+        'median_ms': round(statistics.median(ordered), 3),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        'mean_ms': round(statistics.fmean(ordered), 3),
+    }
+    if queries:
+        result['queries_median'] = statistics.median(queries)
+    return result
+
+
+def http_cases(app, rng):
+    # (name, list of URLs cycled through the repetitions)
+    from app import Article, db
+    with app.app_context():
+        total = db.session.query(db.func.count(Article.id)).scalar()
+        max_id = db.session.query(db.func.max(Article.id)).scalar() or 1
+    ids = [rng.randint(1, max_id) for _ in range(50)]
+    return [
+        ('articles_default', ['/api/articles']),
+        ('articles_filter_source', ['/api/articles?source=ndtv.com', '/api/articles?source=thedailystar.net']),
+        ('articles_filter_sentiment_dates',
+         ['/api/articles?sentiment=Negative&start=2025-06-01&end=2025-09-30']),
+        ('articles_search', ['/api/articles?search=Teesta', '/api/articles?search=extradition']),
+        ('articles_deep_offset', [f'/api/articles?offset={max(0, int(total * 0.9))}']),
+        ('article_detail', [f'/api/articles/{i}' for i in ids]),
+        ('dashboard', ['/api/dashboard']),
+        ('dashboard_filtered', ['/api/dashboard?source=ndtv.com&start=2025-03-01&end=2025-12-31',
+                                '/api/dashboard?category=Politics']),
+    ]
+
+
+def time_http(app, urls, repeat, warmup=1):
+    import metrics
+    client = app.test_client()
+    samples, queries = [], []
+    for i in range(warmup + repeat):
+        url = urls[i % len(urls)]
+        started = time.perf_counter()
+        response = client.get(url)
+        elapsed = (time.perf_counter() - started) * 1000
+        if response.status_code not in (200, 404):
+            raise RuntimeError(f'{url} returned {response.status_code}')
+        if i >= warmup:
+            samples.append(elapsed)
+            queries.append(metrics.sql_count())
+    return summarize(samples, queries)
+
+
+def time_ingestion(app, repeat, num_results):
+    from app import run_exa_ingestion
+    samples = []
+    with app.app_context():
+        for i in range(repeat):
+            # First pass inserts, later passes take the update path
+            exa = FakeExa(num_results=num_results)
+            started = time.perf_counter()
+            run_exa_ingestion(exa=exa)
+            samples.append((time.perf_counter() - started) * 1000)
+    return summarize(samples)
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare_results(baseline, current, threshold, metric='median_ms'):
+    # Returns a list of (key, case, old, new, ratio) regressions beyond threshold
+    regressions = []
+    for key, cases in current.get('results', {}).items():
+        for case, stats in cases.items():
+            old = baseline.get('results', {}).get(key, {}).get(case)
+            if not old or not old.get(metric):
+                continue
+            ratio = stats[metric] / old[metric]
+            marker = ''
+            if ratio > 1 + threshold:
+                regressions.append((key, case, old[metric], stats[metric], ratio))
+                marker = '  REGRESSION'
+            print(f"  {key:>6} {case:<34} {old[metric]:>10.2f} -> {stats[metric]:>10.2f} ms ({ratio:5.2f}x){marker}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ingestion and API hot paths on a synthetic corpus.')
+    parser.add_argument('--sizes', default='1k,10k', help='comma separated: 1k,10k,100k,1m or integers')
+    parser.add_argument('--data-dir', default=os.path.join(BACKEND_DIR, 'instance', 'bench'))
+    parser.add_argument('--fresh', action='store_true', help='rebuild cached corpora')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--cases', default='', help='comma separated subset of case names')
+    parser.add_argument('--ingest-results', type=int, default=100, help='items per fake Exa response')
+    parser.add_argument('--skip-ingestion', action='store_true')
+    parser.add_argument('--spacy-model', default=None)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', default=None, help='write results JSON here')
+    parser.add_argument('--compare', default=None, help='baseline results JSON')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown ratio vs baseline')
+    args = parser.parse_args()
+
+    if args.spacy_model:
+        os.environ['SPACY_MODEL'] = args.spacy_model
+    selected = set(filter(None, args.cases.split(',')))
+    os.makedirs(args.data_dir, exist_ok=True)
+    report = {
+        'meta': {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'git': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+        },
+        'results': {}
+    }
+    for size in args.sizes.split(','):
+        rows = parse_rows(size)
+        db_path = os.path.join(args.data_dir, f'corpus_{rows}_{args.seed}.db')
+        print(f"== {size} ({rows} articles) -> {db_path}")
+        started = time.perf_counter()
+        app = create_corpus(db_path, rows, seed_value=args.seed, force=args.fresh)
+        print(f"   corpus ready in {time.perf_counter() - started:.1f}s")
+        rng = random.Random(args.seed)
+        results = {}
+        for name, urls in http_cases(app, rng):
+            if selected and name not in selected:
+                continue
+            results[name] = time_http(app, urls, args.repeat)
+            print(f"   {name:<34} median {results[name]['median_ms']:>10.2f} ms  "
+                  f"p95 {results[name]['p95_ms']:>10.2f} ms  queries {results[name].get('queries_median')}")
+        if not args.skip_ingestion and (not selected or 'ingestion' in selected):
+            # Last, since it writes to the corpus
+            results['ingestion'] = time_ingestion(app, max(1, min(args.repeat, 3)), args.ingest_results)
+            print(f"   {'ingestion':<34} median {results['ingestion']['median_ms']:>10.2f} ms")
+        report['results'][size] = results
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.out}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"Compared with {args.compare} (threshold {args.threshold:.0%}):")
+        regressions = compare_results(baseline, report, args.threshold)
+        if regressions:
+            print(f"FAIL: {len(regressions)} case(s) regressed")
+            return 1
+        print("OK: no regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Duplicate detection at ingest.
+#
+# canonical_url() folds the URL variants of one story (tracking parameters,
+# AMP pages, mobile hosts, http/https, trailing slashes) into one key, so a
+# re-fetched variant updates the existing article instead of adding a row.
+#
+# simhash() fingerprints an article body: 64-bit SimHash over 3-word
+# shingles, so near-identical bodies (a wire story syndicated with a
+# different byline or footer) differ in only a few bits. Lookups split the
+# hash into BANDS 16-bit bands: by pigeonhole, two hashes within
+# MAX_DISTANCE (< BANDS) bits agree exactly on at least one band, so an
+# index on (band, value) finds every candidate with BANDS equality lookups.
+
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'igshid', 'mc_cid', 'mc_eid', 'yclid', '_gl', 'spm',
+    'ref', 'ref_src', 'ref_url', 'referrer', 'cmpid', 'cmp', 'ito', 'icid', 'ncid', 'ocid', 'pfrom',
+    'homepage', 'sr_share', 'share', 'amp', 'outputtype', 'utm', 'via', 'taid', 'fromapp',
+}
+TRACKING_PREFIXES = ('utm_', 'ns_', 'pk_', 'mtm_', 'hsa_')
+HOST_PREFIXES = ('www.', 'm.', 'mobile.', 'amp.')
+
+BANDS = 4
+BAND_BITS = 64 // BANDS
+MAX_DISTANCE = 3
+MIN_TOKENS = 30  # shorter bodies are not fingerprinted
+
+_token = re.compile(r'\w+', re.UNICODE)
+
+
+def _amp_path(path):
+    # /story/amp, /amp/story, /story.amp(.html), /amp_articleshow/ (TOI)
+    path = path.replace('/amp_articleshow/', '/articleshow/')
+    if path.endswith('/amp') or path.endswith('/amp/'):
+        path = path[:path.rindex('/amp')]
+    if path.startswith('/amp/'):
+        path = path[4:]
+    if path.endswith('.amp'):
+        path = path[:-4]
+    elif path.endswith('.amp.html'):
+        path = path[:-9] + '.html'
+    return path
+
+
+def canonical_url(url):
+    if not url:
+        return url
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url.strip()
+    host = (parts.hostname or '').rstrip('.')
+    changed = True
+    while changed:
+        changed = False
+        for prefix in HOST_PREFIXES:
+            if host.startswith(prefix) and host.count('.') > 1:
+                host = host[len(prefix):]
+                changed = True
+    if port and port not in (80, 443):
+        host = f'{host}:{port}'
+    path = re.sub('/{2,}', '/', _amp_path(parts.path or '/'))
+    if len(path) > 1:
+        path = path.rstrip('/')
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES))
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+def simhash(text):
+    # -> unsigned 64-bit fingerprint, or None for short/missing text
+    import numpy as np  # not at module level: app.py imports this module
+    tokens = _token.findall((text or '').lower())
+    if len(tokens) < MIN_TOKENS:
+        return None
+    shingles = {' '.join(tokens[i:i + 3]) for i in range(len(tokens) - 2)}
+    hashes = np.fromiter((int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'little')
+                          for s in shingles), dtype=np.uint64, count=len(shingles))
+    # One bit vote per shingle and position; the fingerprint keeps the
+    # majority bit
+    bits = np.unpackbits(hashes.view(np.uint8)).reshape(-1, 64)
+    majority = bits.sum(axis=0, dtype=np.int64) * 2 > len(shingles)
+    return int(np.packbits(majority).view('<u8')[0])
+
+
+def hamming(a, b):
+    return bin(a ^ b).count('1')
+
+
+def bands(value):
+    # -> [(band number, band value)] for the (band, value) index
+    mask = (1 << BAND_BITS) - 1
+    return [(band, (value >> (band * BAND_BITS)) & mask) for band in range(BANDS)]
+
+
+def to_signed(value):
+    # unsigned 64-bit <-> the signed BIGINT databases store
+    if value is None:
+        return None
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def to_unsigned(value):
+    if value is None:
+        return None
+    return value + (1 << 64) if value < 0 else value
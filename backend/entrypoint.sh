@@ -1,14 +1,28 @@
 #!/bin/bash
 set -e
 
+# Read replica: serve published snapshots only (no cron, migrations or ingestion)
+case "${REPLICA_MODE,,}" in
+    1|true|yes|on)
+        exec flask run --host=0.0.0.0 --port=5000
+        ;;
+esac
+
 # Start cron service
 service cron start
 
-# Run database migrations
-flask db upgrade
+# Run database migrations (retried while a database server starts up)
+for attempt in 1 2 3 4 5 6 7 8 9 10; do
+    flask db upgrade && break
+    [ "$attempt" = 10 ] && exit 1
+    sleep 3
+done
+
+# Initial data fetch (slices that are due)
+flask fetch-exa --due
 
-# Initial data fetch
-flask fetch-exa
+# Fill the entity index for articles not processed yet
+flask extract-entities
 
 # Start the Flask server
 flask run --host=0.0.0.0 --port=5000 
\ No newline at end of file
@@ -0,0 +1,78 @@
+import collections
+import json
+import threading
+
+# In-process fan-out for Server-Sent Events. One publisher (the change poller)
+# appends to a bounded buffer and wakes every waiting stream at once; idle
+# connections just sit on a shared Condition, so they cost a blocked thread
+# (or greenlet) and no per-connection polling or queries.
+
+
+class EventBroker:
+    def __init__(self, maxlen=1000):
+        # (seq, event_id, event_type, data); seq is broker-local and only used
+        # to hand each waiter what it has not seen yet
+        self._events = collections.deque(maxlen=maxlen)
+        self._cond = threading.Condition()
+        self._seq = 0
+        self._clients = 0
+
+    @property
+    def clients(self):
+        return self._clients
+
+    @property
+    def seq(self):
+        return self._seq
+
+    def publish(self, events):
+        # events: iterable of (event_id or None, event_type, data)
+        with self._cond:
+            for event_id, event_type, data in events:
+                self._seq += 1
+                self._events.append((self._seq, event_id, event_type, data))
+            self._cond.notify_all()
+
+    def connect(self, max_clients):
+        with self._cond:
+            if max_clients and self._clients >= max_clients:
+                return False
+            self._clients += 1
+            return True
+
+    def disconnect(self):
+        with self._cond:
+            self._clients -= 1
+
+    def wait(self, since_seq, timeout):
+        # Blocks until something is published after since_seq or the timeout
+        # elapses. Returns (seq, events, overflowed); overflowed means the
+        # buffer wrapped past since_seq and the caller should resync.
+        with self._cond:
+            if self._seq == since_seq:
+                self._cond.wait(timeout)
+            if self._seq == since_seq:
+                return since_seq, [], False
+            oldest = self._events[0][0] if self._events else self._seq + 1
+            overflowed = since_seq + 1 < oldest
+            events = [e[1:] for e in self._events if e[0] > since_seq]
+            return self._seq, events, overflowed
+
+
+def format_sse(event_type=None, data=None, event_id=None, retry=None):
+    lines = []
+    if retry is not None:
+        lines.append(f'retry: {retry}')
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    if event_type:
+        lines.append(f'event: {event_type}')
+    if data is not None:
+        payload = data if isinstance(data, str) else json.dumps(data, default=str, separators=(',', ':'))
+        for line in payload.splitlines() or ['']:
+            lines.append(f'data: {line}')
+    return '\n'.join(lines) + '\n\n'
+
+
+def heartbeat():
+    return ': keepalive\n\n'
@@ -0,0 +1,70 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from types import SimpleNamespace
+
+# Content-addressed archive of raw Exa results.
+#
+# Every result of a search_and_contents call is stored as canonical JSON,
+# gzip-compressed, under its SHA-256:
+#     <root>/ab/cd/abcd....json.gz
+# so a story returned unchanged by many fetches is stored once. Which fetch
+# returned what (URL, position, fetch time) is indexed in the database
+# (exa_fetch / exa_fetch_item), and `flask replay-exa` re-runs normalization
+# over the archive without calling Exa.
+
+
+def _plain(value):
+    # exa_py results are dataclasses (benchmarks pass SimpleNamespace); nested
+    # values (subpages, entities) may be too
+    if hasattr(value, '__dict__'):
+        return {k: v for k, v in vars(value).items() if not k.startswith('_')}
+    return str(value)
+
+
+def serialize_result(item):
+    return json.dumps(_plain(item), default=_plain, sort_keys=True, separators=(',', ':'),
+                      ensure_ascii=False).encode('utf-8')
+
+
+def pack_item(item):
+    # Compressed payload for the ingestion queue (same encoding as the archive)
+    return gzip.compress(serialize_result(item), 6)
+
+
+def unpack_item(blob):
+    # -> an object with the same attributes run_exa_ingestion reads
+    return SimpleNamespace(**json.loads(gzip.decompress(blob)))
+
+
+def item_path(root, digest):
+    return os.path.join(root, digest[:2], digest[2:4], digest + '.json.gz')
+
+
+def write_item(root, item):
+    # Returns the digest; an existing object is left alone
+    raw = serialize_result(item)
+    digest = hashlib.sha256(raw).hexdigest()
+    path = item_path(root, digest)
+    if os.path.exists(path):
+        return digest
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    # Write-then-rename so readers never see a partial object
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(gzip.compress(raw, 6))
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return digest
+
+
+def read_item(root, digest):
+    with open(item_path(root, digest), 'rb') as f:
+        return unpack_item(f.read())
@@ -0,0 +1,151 @@
+import datetime
+import functools
+import gzip
+import hashlib
+
+from flask import current_app, make_response, request
+
+from metrics import CACHE_REQUESTS
+
+try:
+    import brotli
+except ImportError:  # optional: without it we only negotiate gzip
+    brotli = None
+
+# --- Conditional requests ---
+# Views decorated with @conditional(stamp_fn) get a strong ETag and a
+# Last-Modified header derived from a cheap stamp lookup. A matching
+# If-None-Match / If-Modified-Since short-circuits to 304 before the view
+# (and its queries / JSON serialization) runs at all.
+
+EPOCH = datetime.datetime(1970, 1, 1)
+ENCODING_SUFFIXES = ('-br', '-gzip')
+
+
+def make_etag(*parts):
+    digest = hashlib.sha1('|'.join(str(p) for p in parts).encode('utf-8')).hexdigest()
+    return digest[:20]
+
+
+def _strip_etag(tag):
+    tag = tag.strip()
+    if tag.startswith('W/'):
+        tag = tag[2:]
+    tag = tag.strip('"')
+    for suffix in ENCODING_SUFFIXES:
+        if tag.endswith(suffix):
+            return tag[:-len(suffix)]
+    return tag
+
+
+def _not_modified(etag, last_modified):
+    # Returns the validator to echo in the 304 (the client's own tag, which may
+    # carry an encoding suffix), or None when the view has to run.
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        # If-None-Match wins over If-Modified-Since when both are sent
+        if if_none_match.strip() == '*':
+            return etag
+        for tag in if_none_match.split(','):
+            if _strip_etag(tag) == etag:
+                return tag.strip().strip('"')
+        return None
+    if request.if_modified_since and last_modified:
+        ims = request.if_modified_since.replace(tzinfo=None)
+        if last_modified.replace(microsecond=0) <= ims:
+            return etag
+    return None
+
+
+def _set_validators(response, etag, last_modified):
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified.replace(tzinfo=datetime.timezone.utc)
+    # Let browsers keep the body but revalidate on every poll
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def conditional(stamp_fn):
+    # stamp_fn(**view_args) -> (etag_parts, last_modified datetime or None).
+    # It may abort (e.g. 404) itself. The full path including the query string
+    # is always part of the ETag since filters change the representation.
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(*args, **kwargs)
+            etag_parts, last_modified = stamp_fn(**kwargs)
+            etag = make_etag(request.full_path, *etag_parts)
+            matched = _not_modified(etag, last_modified)
+            if matched:
+                CACHE_REQUESTS.labels('http_conditional', 'hit').inc()
+                return _set_validators(make_response('', 304), matched, last_modified)
+            CACHE_REQUESTS.labels('http_conditional', 'miss').inc()
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                _set_validators(response, etag, last_modified)
+            return response
+        return wrapper
+    return decorator
+
+
+# --- Response compression ---
+
+def _accepted_encodings(header):
+    accepted = {}
+    for part in (header or '').split(','):
+        pieces = part.strip().split(';')
+        coding = pieces[0].strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in pieces[1:]:
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def choose_encoding(header):
+    accepted = _accepted_encodings(header)
+    candidates = (['br'] if brotli is not None else []) + ['gzip']
+    best, best_q = None, 0.0
+    for coding in candidates:
+        q = accepted.get(coding, accepted.get('*', 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress_response(response):
+    # after_request hook for the API blueprint
+    response.vary.add('Accept-Encoding')
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype == 'text/event-stream'):
+        return response
+    min_size = current_app.config.get('COMPRESS_MIN_SIZE', 1024)
+    if response.content_length is not None and response.content_length < min_size:
+        return response
+    coding = choose_encoding(request.headers.get('Accept-Encoding'))
+    if coding is None:
+        return response
+    body = response.get_data()
+    if len(body) < min_size:
+        return response
+    if coding == 'br':
+        body = brotli.compress(body, quality=current_app.config.get('COMPRESS_BROTLI_QUALITY', 5))
+    else:
+        body = gzip.compress(body, compresslevel=current_app.config.get('COMPRESS_GZIP_LEVEL', 6), mtime=0)
+    response.set_data(body)
+    response.headers['Content-Encoding'] = coding
+    # Each encoding is a distinct representation, so it gets its own strong ETag
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f'{etag}-{coding}')
+    return response
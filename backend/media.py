@@ -0,0 +1,272 @@
+import functools
+import hashlib
+import http.client
+import io
+import ipaddress
+import os
+import socket
+import ssl
+import tempfile
+import time
+import urllib.parse
+import urllib.request
+
+# Local cache of article images and favicons, served by /api/media/<key> so
+# pages do not hot-link dozens of outlet CDNs.
+#
+# Assets are keyed by a hash of their kind and source URL and stored as
+#     <root>/ab/<key>.orig     the downloaded bytes
+#     <root>/ab/<key>.thumb    a fixed-size thumbnail (THUMBNAILS)
+# Serving touches the thumbnail's mtime, so prune() can evict the least
+# recently used assets once the cache grows past its size limit. Pillow is
+# imported on first use, like spaCy in nlp.py.
+
+# kind -> (size, format, content type). Images are cover-cropped to the 16:9
+# cards and article header; favicons are fitted into a transparent square at
+# twice the 32px the pages draw them.
+THUMBNAILS = {
+    'image': ((800, 450), 'WEBP', 'image/webp'),
+    'favicon': ((64, 64), 'PNG', 'image/png'),
+}
+VARIANTS = {'thumb': '.thumb', 'original': '.orig'}
+# Originals are served only as one of these, as Pillow decoded them, never
+# with the type the origin claimed (image/svg+xml could carry script)
+ORIGINAL_TYPES = {'image/jpeg', 'image/png', 'image/gif', 'image/webp', 'image/avif', 'image/bmp', 'image/x-icon'}
+
+# Decoding bound: anything larger is refused before its pixels are read
+MAX_PIXELS = 40_000_000
+# An interrupted write leaves a .tmp file; prune removes those after this long
+STALE_TMP_SECONDS = 3600
+USER_AGENT = 'Mozilla/5.0 (compatible; SIMS-Analytics media cache)'
+
+
+def media_key(url, kind):
+    return hashlib.blake2b(f"{kind}\0{url}".encode('utf-8'), digest_size=16).hexdigest()
+
+
+def asset_path(root, key, variant='thumb'):
+    return os.path.join(root, key[:2], key + VARIANTS[variant])
+
+
+# --- Fetching ---
+
+def _check_url(url):
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        raise ValueError(f"unsupported URL {url!r}")
+
+
+def _connect(host, port, timeout, allow_private):
+    # Article metadata comes from third-party pages: refuse hosts that point
+    # into our own network (the database, the metadata service, ...). The
+    # socket connects to the very address that was checked; resolving again
+    # to connect would let a second DNS answer slip in between (rebinding).
+    infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    if not allow_private:
+        for info in infos:
+            address = ipaddress.ip_address(info[4][0].split('%', 1)[0])
+            if not address.is_global:
+                raise ValueError(f"{host} resolves to non-public address {address}")
+    error = OSError(f"{host} did not resolve")
+    for family, type_, proto, _, address in infos:
+        sock = socket.socket(family, type_, proto)
+        try:
+            sock.settimeout(timeout)
+            sock.connect(address)
+            return sock
+        except OSError as e:
+            sock.close()
+            error = e
+    raise error
+
+
+class _CheckedHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, host, allow_private=False, **kwargs):
+        super().__init__(host, **kwargs)
+        self.allow_private = allow_private
+
+    def connect(self):
+        self.sock = _connect(self.host, self.port, self.timeout, self.allow_private)
+
+
+class _CheckedHTTPSConnection(http.client.HTTPSConnection):
+    def __init__(self, host, allow_private=False, tls=None, **kwargs):
+        super().__init__(host, context=tls, **kwargs)
+        self.allow_private = allow_private
+        self.tls = tls
+
+    def connect(self):
+        sock = _connect(self.host, self.port, self.timeout, self.allow_private)
+        # Certificate and SNI still for the host name, not the pinned address
+        self.sock = self.tls.wrap_socket(sock, server_hostname=self.host)
+
+
+class _CheckedHTTPHandler(urllib.request.HTTPHandler):
+    def __init__(self, allow_private):
+        super().__init__()
+        self.allow_private = allow_private
+
+    def http_open(self, req):
+        return self.do_open(functools.partial(_CheckedHTTPConnection, allow_private=self.allow_private), req)
+
+
+class _CheckedHTTPSHandler(urllib.request.HTTPSHandler):
+    def __init__(self, allow_private):
+        super().__init__()
+        self.allow_private = allow_private
+
+    def https_open(self, req):
+        return self.do_open(functools.partial(_CheckedHTTPSConnection, allow_private=self.allow_private,
+                                              tls=ssl.create_default_context()), req)
+
+
+class _CheckedRedirects(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        _check_url(newurl)
+        return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+
+def download(url, max_bytes, timeout, allow_private=False):
+    # -> (content type, body); fails on non-image responses and bodies over
+    # max_bytes. Connects directly (no proxy): the address check is on the
+    # connection itself, redirects included.
+    _check_url(url)
+    opener = urllib.request.build_opener(urllib.request.ProxyHandler({}), _CheckedHTTPHandler(allow_private),
+                                         _CheckedHTTPSHandler(allow_private), _CheckedRedirects())
+    request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT, 'Accept': 'image/*,*/*;q=0.5'})
+    with opener.open(request, timeout=timeout) as response:
+        content_type = (response.headers.get_content_type() or '').lower()
+        # Favicons are often served as octet-stream; decoding is the real check
+        if not (content_type.startswith('image/') or content_type == 'application/octet-stream'):
+            raise ValueError(f"not an image ({content_type})")
+        length = response.headers.get('Content-Length')
+        if length and length.isdigit() and int(length) > max_bytes:
+            raise ValueError(f"too large ({length} bytes)")
+        body = response.read(max_bytes + 1)
+    if len(body) > max_bytes:
+        raise ValueError(f"too large (over {max_bytes} bytes)")
+    if not body:
+        raise ValueError("empty response")
+    return content_type, body
+
+
+def make_thumbnail(data, kind):
+    # -> (thumbnail bytes in THUMBNAILS[kind]'s format, content type of
+    # data as decoded)
+    from PIL import Image, ImageOps
+    size, fmt, _ = THUMBNAILS[kind]
+    with Image.open(io.BytesIO(data)) as img:
+        if img.width * img.height > MAX_PIXELS:
+            raise ValueError(f"image too large ({img.width}x{img.height})")
+        detected = Image.MIME.get(img.format)
+        # JPEG only: decode at the smallest scale still at least twice the target
+        img.draft('RGB', (size[0] * 2, size[1] * 2))
+        img = ImageOps.exif_transpose(img)
+        if kind == 'image':
+            thumb = ImageOps.fit(img.convert('RGB'), size, Image.Resampling.LANCZOS)
+        else:
+            img = img.convert('RGBA')
+            img.thumbnail(size, Image.Resampling.LANCZOS)
+            thumb = Image.new('RGBA', size, (0, 0, 0, 0))
+            thumb.paste(img, ((size[0] - img.width) // 2, (size[1] - img.height) // 2))
+    out = io.BytesIO()
+    if fmt == 'WEBP':
+        thumb.save(out, fmt, quality=80, method=4)
+    else:
+        thumb.save(out, fmt, optimize=True)
+    return out.getvalue(), detected
+
+
+def _write(path, data):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    # Write-then-rename so the server never sends a partial file
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def fetch_asset(root, url, kind, max_bytes, timeout, allow_private=False):
+    # Downloads one asset and stores it with its thumbnail; -> (content type
+    # of the original as decoded, or None when it is not one of
+    # ORIGINAL_TYPES; bytes stored). Touches no database, so it can run in
+    # worker threads.
+    _, data = download(url, max_bytes, timeout, allow_private)
+    thumb, content_type = make_thumbnail(data, kind)
+    if content_type not in ORIGINAL_TYPES:
+        content_type = None
+    key = media_key(url, kind)
+    # The thumbnail last: its presence is what the server checks
+    _write(asset_path(root, key, 'original'), data)
+    _write(asset_path(root, key, 'thumb'), thumb)
+    return content_type, len(data) + len(thumb)
+
+
+# --- Serving and eviction ---
+
+def touch(path, min_age=3600):
+    # Marks a served file as recently used; at most once per min_age, so a
+    # popular thumbnail does not cost a metadata write per request
+    try:
+        if time.time() - os.stat(path).st_mtime > min_age:
+            os.utime(path)
+    except OSError:
+        pass
+
+
+def cache_usage(root):
+    # -> {key: [bytes, last use (newest mtime), paths]}
+    assets = {}
+    now = time.time()
+    if not os.path.isdir(root):
+        return assets
+    for shard in os.scandir(root):
+        if not shard.is_dir():
+            continue
+        for entry in os.scandir(shard.path):
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            if entry.name.endswith('.tmp'):
+                if now - st.st_mtime > STALE_TMP_SECONDS:
+                    _remove(entry.path)
+                continue
+            asset = assets.setdefault(entry.name.split('.', 1)[0], [0, 0.0, []])
+            asset[0] += st.st_size
+            asset[1] = max(asset[1], st.st_mtime)
+            asset[2].append(entry.path)
+    return assets
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def prune(root, max_bytes, low_water=0.9):
+    # Once the cache is over max_bytes, evicts the least recently used assets
+    # until it is under low_water * max_bytes (so it does not prune again on
+    # the next fetch). -> (evicted keys, bytes in the cache)
+    assets = cache_usage(root)
+    total = sum(asset[0] for asset in assets.values())
+    if total <= max_bytes:
+        return [], total
+    evicted = []
+    for key, (size, _, paths) in sorted(assets.items(), key=lambda kv: kv[1][1]):
+        if total <= max_bytes * low_water:
+            break
+        # Thumbnail first, so the server stops offering the asset
+        for path in sorted(paths, key=lambda p: not p.endswith(VARIANTS['thumb'])):
+            _remove(path)
+        total -= size
+        evicted.append(key)
+    return evicted, total
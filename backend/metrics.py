@@ -0,0 +1,284 @@
+import bisect
+import itertools
+import threading
+import time
+import weakref
+
+# Minimal Prometheus instrumentation, cheap enough to leave on in production.
+#
+# Hot-path updates never take a lock: every thread writes to its own shard
+# (a pre-allocated list of bucket counts) and only the /api/metrics scrape
+# sums the shards. A lock is taken once per (metric, labels, thread) when a
+# shard is first created, and once when its thread ends and the shard is
+# folded into the metric's retired totals.
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000)
+
+_registry = []
+_registry_lock = threading.Lock()
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _label_str(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _fmt(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(value)
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Slot:
+    # Lives in the writing thread's locals; when the thread ends it is
+    # collected and its shard retired (see _Sharded.shard)
+    __slots__ = ('__weakref__',)
+
+
+class _Sharded:
+    # One list per live writing thread; `size` slots each
+    def __init__(self, size):
+        self._size = size
+        self._local = threading.local()
+        self._shards = {}
+        self._keys = itertools.count()
+        self._retired = [0] * size  # summed shards of threads that have ended
+        self._lock = threading.Lock()
+
+    def shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = [0] * self._size
+            with self._lock:
+                key = next(self._keys)
+                self._shards[key] = shard
+            self._local.shard = shard
+            self._local.slot = slot = _Slot()
+            # Threaded servers run each request on a new thread: fold the
+            # shard into _retired when this one ends, so shards do not pile up
+            weakref.finalize(slot, self._retire, key)
+        return shard
+
+    def _retire(self, key):
+        with self._lock:
+            for i, v in enumerate(self._shards.pop(key)):
+                self._retired[i] += v
+
+    def totals(self):
+        with self._lock:
+            shards = list(self._shards.values())
+            totals = list(self._retired)
+        for shard in shards:
+            for i, v in enumerate(shard):
+                totals[i] += v
+        return totals
+
+
+class _Timer:
+    __slots__ = ('_observe', '_start')
+
+    def __init__(self, observe):
+        self._observe = observe
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._observe(time.perf_counter() - self._start)
+        return False
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._children_lock = threading.Lock()
+        with _registry_lock:
+            _registry.append(self)
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            with self._children_lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._new_child()
+                    self._children[values] = child
+        return child
+
+    def _default(self):
+        return self.labels()
+
+    def collect(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        for values, child in sorted(self._children.items()):
+            lines.extend(child.samples(self.name, self.labelnames, values))
+        return lines
+
+
+class _CounterChild:
+    def __init__(self):
+        self._values = _Sharded(1)
+
+    def inc(self, amount=1):
+        self._values.shard()[0] += amount
+
+    def get(self):
+        return self._values.totals()[0]
+
+    def samples(self, name, labelnames, values):
+        return [f'{name}_total{_label_str(labelnames, values)} {_fmt(self.get())}']
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1):
+        self._default().inc(amount)
+
+
+class _GaugeChild:
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def samples(self, name, labelnames, values):
+        return [f'{name}{_label_str(labelnames, values)} {_fmt(self.value)}']
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value):
+        self._default().set(value)
+
+
+class _HistogramChild:
+    def __init__(self, bounds):
+        self._bounds = bounds
+        # slots: one per bucket (+Inf last), then sum, then count
+        self._n = len(bounds) + 1
+        self._values = _Sharded(self._n + 2)
+
+    def observe(self, value):
+        shard = self._values.shard()
+        shard[bisect.bisect_left(self._bounds, value)] += 1
+        shard[self._n] += value
+        shard[self._n + 1] += 1
+
+    def time(self):
+        return _Timer(self.observe)
+
+    def samples(self, name, labelnames, values):
+        totals = self._values.totals()
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self._bounds + (float('inf'),), totals[:self._n]):
+            cumulative += count
+            le = 'le="%s"' % _fmt(float(bound))
+            lines.append(f'{name}_bucket{_label_str(labelnames, values, le)} {cumulative}')
+        lines.append(f'{name}_sum{_label_str(labelnames, values)} {_fmt(float(totals[self._n]))}')
+        lines.append(f'{name}_count{_label_str(labelnames, values)} {totals[self._n + 1]}')
+        return lines
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self._bounds = tuple(sorted(float(b) for b in buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self._bounds)
+
+    def observe(self, value):
+        self._default().observe(value)
+
+    def time(self):
+        return self._default().time()
+
+
+def render():
+    with _registry_lock:
+        metrics = list(_registry)
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.collect())
+    return '\n'.join(lines) + '\n'
+
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# --- SQL statement counting ---
+# Incremented from a SQLAlchemy before_cursor_execute hook; the count is per
+# thread so a request can read how many statements it issued.
+_sql_local = threading.local()
+
+
+def count_sql_statement(*_args, **_kwargs):
+    _sql_local.count = getattr(_sql_local, 'count', 0) + 1
+
+
+def reset_sql_count():
+    _sql_local.count = 0
+
+
+def sql_count():
+    return getattr(_sql_local, 'count', 0)
+
+
+# --- Application metrics ---
+
+EXA_REQUEST_SECONDS = Histogram(
+    'sims_exa_request_seconds', 'Latency of Exa search_and_contents calls.')
+INGEST_STAGE_SECONDS = Histogram(
+    'sims_ingest_stage_seconds', 'Per-item ingestion time by stage.', ['stage'])
+INGEST_ITEMS = Counter(
+    'sims_ingest_items', 'Items seen by ingestion, by outcome.', ['outcome'])
+INGEST_LAST_RUN_ITEMS = Gauge(
+    'sims_ingest_last_run_items', 'Items per outcome in the most recent ingestion run.', ['outcome'])
+INGEST_RUNS = Counter(
+    'sims_ingest_runs', 'Completed ingestion runs.')
+POLL_INTERVAL_SECONDS = Gauge(
+    'sims_poll_interval_seconds', 'Current adaptive polling interval by query slice.', ['slice'])
+POLL_YIELD = Counter(
+    'sims_poll_yield', 'Articles new or changed by polling runs, by slice and source group.', ['slice', 'group'])
+EXA_BUDGET_REMAINING = Gauge(
+    'sims_exa_budget_remaining', 'Exa calls left in the rolling daily budget.')
+NER_SECONDS = Histogram(
+    'sims_ner_seconds', 'spaCy NER time per document.')
+HTTP_REQUEST_SECONDS = Histogram(
+    'sims_http_request_seconds', 'API request latency by endpoint.', ['endpoint', 'status'])
+HTTP_REQUEST_QUERIES = Histogram(
+    'sims_http_request_queries', 'SQL statements issued per API request.', ['endpoint'], buckets=COUNT_BUCKETS)
+REPLICA_SNAPSHOT_TIMESTAMP = Gauge(
+    'sims_replica_snapshot_timestamp_seconds', 'Publication time of the snapshot a read replica serves.')
+CACHE_REQUESTS = Counter(
+    'sims_cache_requests', 'Cache lookups by cache and result (hit/miss).', ['cache', 'result'])
+MEDIA_FETCHES = Counter(
+    'sims_media_fetches', 'Image and favicon fetches for the media cache, by outcome.', ['outcome'])
+MEDIA_CACHE_BYTES = Gauge(
+    'sims_media_cache_bytes', 'Size of the local media cache on disk.')
@@ -0,0 +1,46 @@
+"""Add article_change log
+
+Revision ID: 0a4d6e8b2c57
+Revises: f0b93d5e7c21
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0a4d6e8b2c57'
+down_revision = 'f0b93d5e7c21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('article_change',
+    sa.Column('seq', sa.Integer(), nullable=False),
+    sa.Column('article_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=16), nullable=False),
+    sa.Column('fields', sa.Text(), nullable=True),
+    sa.Column('changed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['article_id'], ['article.id'], ),
+    sa.PrimaryKeyConstraint('seq'),
+    sqlite_autoincrement=True
+    )
+    with op.batch_alter_table('article_change', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_article_change_article_id'), ['article_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_article_change_changed_at'), ['changed_at'], unique=False)
+
+    # One 'inserted' entry per existing article, oldest change first, so a
+    # client can sync from since=0
+    op.execute("INSERT INTO article_change (article_id, kind, fields, changed_at) "
+               "SELECT id, 'inserted', NULL, COALESCE(updated_at, CURRENT_TIMESTAMP) FROM article "
+               "ORDER BY updated_at, id")
+
+
+def downgrade():
+    with op.batch_alter_table('article_change', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_article_change_changed_at'))
+        batch_op.drop_index(batch_op.f('ix_article_change_article_id'))
+
+    op.drop_table('article_change')
@@ -0,0 +1,33 @@
+"""Add PostgreSQL full-text search and summary category indexes
+
+Revision ID: 1c6e9a3f7b42
+Revises: 0a4d6e8b2c57
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '1c6e9a3f7b42'
+down_revision = '0a4d6e8b2c57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # PostgreSQL only (see database.py): the search index behind
+    # /api/articles?search= and the category lookup into summary_json
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    from database import POSTGRES_DDL
+    for statement in POSTGRES_DDL:
+        op.execute(statement)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    from database import POSTGRES_DROP
+    for statement in POSTGRES_DROP:
+        op.execute(statement)
@@ -0,0 +1,31 @@
+"""Add updated_at change stamp to Article
+
+Revision ID: 3c1d2e4f5a6b
+Revises: 651bc5ed60f4
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1d2e4f5a6b'
+down_revision = '651bc5ed60f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_article_updated_at'), ['updated_at'], unique=False)
+
+    # Give existing rows a stamp so HTTP validators have something to work with
+    op.execute("UPDATE article SET updated_at = CURRENT_TIMESTAMP WHERE updated_at IS NULL")
+
+
+def downgrade():
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_article_updated_at'))
+        batch_op.drop_column('updated_at')
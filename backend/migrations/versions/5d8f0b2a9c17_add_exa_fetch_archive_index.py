@@ -0,0 +1,54 @@
+"""Add exa_fetch / exa_fetch_item archive index
+
+Revision ID: 5d8f0b2a9c17
+Revises: e41a7c93d2b5
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d8f0b2a9c17'
+down_revision = 'e41a7c93d2b5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('exa_fetch',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('fetched_at', sa.DateTime(), nullable=False),
+    sa.Column('search_query', sa.String(), nullable=False),
+    sa.Column('result_count', sa.Integer(), nullable=False),
+    sa.Column('meta', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('exa_fetch', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_exa_fetch_fetched_at'), ['fetched_at'], unique=False)
+
+    op.create_table('exa_fetch_item',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('fetch_id', sa.Integer(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('url', sa.String(), nullable=False),
+    sa.Column('digest', sa.String(length=64), nullable=False),
+    sa.ForeignKeyConstraint(['fetch_id'], ['exa_fetch.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('exa_fetch_item', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_exa_fetch_item_fetch_id'), ['fetch_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_exa_fetch_item_url'), ['url'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('exa_fetch_item', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_exa_fetch_item_url'))
+        batch_op.drop_index(batch_op.f('ix_exa_fetch_item_fetch_id'))
+
+    op.drop_table('exa_fetch_item')
+    with op.batch_alter_table('exa_fetch', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_exa_fetch_fetched_at'))
+
+    op.drop_table('exa_fetch')
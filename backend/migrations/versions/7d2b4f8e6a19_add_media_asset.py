@@ -0,0 +1,45 @@
+"""Add media_asset for the local image and favicon cache
+
+Revision ID: 7d2b4f8e6a19
+Revises: 1c6e9a3f7b42
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d2b4f8e6a19'
+down_revision = '1c6e9a3f7b42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('media_asset',
+    sa.Column('key', sa.String(length=32), nullable=False),
+    sa.Column('url', sa.String(), nullable=False),
+    sa.Column('kind', sa.String(length=8), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('available_at', sa.DateTime(), nullable=False),
+    sa.Column('lease_owner', sa.String(length=32), nullable=True),
+    sa.Column('content_type', sa.String(), nullable=True),
+    sa.Column('size', sa.Integer(), nullable=True),
+    sa.Column('fetched_at', sa.DateTime(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('changed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('key')
+    )
+    with op.batch_alter_table('media_asset', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_media_asset_changed_at'), ['changed_at'], unique=False)
+        batch_op.create_index('ix_media_asset_status_available_at', ['status', 'available_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('media_asset', schema=None) as batch_op:
+        batch_op.drop_index('ix_media_asset_status_available_at')
+        batch_op.drop_index(batch_op.f('ix_media_asset_changed_at'))
+
+    op.drop_table('media_asset')
@@ -17,6 +17,10 @@ depends_on = None
 
 
 def upgrade():
+    # A second autogenerate of ab736f3630af: the tables exist already when
+    # upgrading an empty database through the whole chain
+    if sa.inspect(op.get_bind()).has_table('article'):
+        return
     # ### commands auto generated by Alembic - please adjust! ###
     op.create_table('article',
     sa.Column('id', sa.Integer(), nullable=False),
@@ -54,8 +58,5 @@ def upgrade():
 
 
 def downgrade():
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.drop_table('int_match')
-    op.drop_table('bd_match')
-    op.drop_table('article')
-    # ### end Alembic commands ###
+    # The tables belong to ab736f3630af, whose downgrade drops them
+    pass
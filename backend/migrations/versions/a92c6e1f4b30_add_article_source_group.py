@@ -0,0 +1,145 @@
+"""Add Article.source_group
+
+Revision ID: a92c6e1f4b30
+Revises: 5d8f0b2a9c17
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+import datetime
+from urllib.parse import urlsplit
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a92c6e1f4b30'
+down_revision = '5d8f0b2a9c17'
+branch_labels = None
+depends_on = None
+
+# The registry as sources.py had it at this revision (domain -> group; 1 indian,
+# 2 bangladeshi, 3 international, 4 fact check), frozen so later edits to
+# sources.py do not change what this migration does
+DOMAINS = {
+    **dict.fromkeys([
+        'timesofindia.indiatimes.com', 'hindustantimes.com', 'ndtv.com', 'thehindu.com', 'indianexpress.com',
+        'indiatoday.in', 'news18.com', 'zeenews.india.com', 'aajtak.in', 'abplive.com', 'jagran.com',
+        'bhaskar.com', 'livehindustan.com', 'business-standard.com', 'economictimes.indiatimes.com',
+        'livemint.com', 'scroll.in', 'thewire.in', 'wionews.com', 'indiatvnews.com', 'newsnationtv.com',
+        'jansatta.com', 'india.com',
+    ], 1),
+    **dict.fromkeys([
+        'bdnews24.com', 'thedailystar.net', 'prothomalo.com', 'dhakatribune.com', 'newagebd.net',
+        'financialexpress.com.bd', 'theindependentbd.com', 'tbsnews.net', 'jugantor.com', 'kalerkantho.com',
+        'banglatribune.com', 'manabzamin.com', 'bssnews.net', 'observerbd.com', 'daily-sun.com',
+        'dailyjanakantha.com', 'thefinancialexpress.com.bd', 'unb.com.bd', 'risingbd.com', 'bangladeshpost.net',
+        'daily-bangladesh.com', 'bhorerkagoj.com', 'dailyinqilab.com', 'samakal.com', 'ittefaq.com.bd',
+        'amardesh.com', 'dailynayadiganta.com', 'dailysangram.com', 'dailyprotidinersangbad.com',
+        'dailyvorerpata.com', 'dailyshomoyeralo.com', 'dailyamadershomoy.com', 'dailykalerkantho.com',
+        'dailysangbad.com', 'dailysun.com', 'dailyasianage.com', 'dailyobserverbd.com', 'dailynewnation.com',
+        'dailyindependentbd.com', 'dailyjanata.com', 'dailyjagaran.com', 'jagonews24.com',
+    ], 2),
+    **dict.fromkeys([
+        'bbc.com', 'reuters.com', 'aljazeera.com', 'apnews.com', 'cnn.com', 'nytimes.com', 'theguardian.com',
+        'france24.com', 'dw.com', 'washingtonpost.com', 'abc.net.au', 'cbc.ca', 'cbsnews.com', 'nbcnews.com',
+        'foxnews.com', 'sky.com', 'japantimes.co.jp', 'straitstimes.com', 'channelnewsasia.com', 'scmp.com',
+        'gulfnews.com', 'arabnews.com', 'rt.com', 'tass.com', 'sputniknews.com', 'chinadaily.com.cn',
+        'globaltimes.cn', 'lemonde.fr', 'spiegel.de', 'elpais.com', 'corriere.it', 'lefigaro.fr', 'asahi.com',
+        'mainichi.jp', 'yomiuri.co.jp', 'koreatimes.co.kr', 'joongang.co.kr', 'hankyoreh.com', 'latimes.com',
+        'usatoday.com', 'bloomberg.com', 'forbes.com', 'wsj.com', 'economist.com', 'ft.com', 'npr.org',
+        'voanews.com', 'rferl.org', 'cna.com.tw', 'thetimes.co.uk', 'independent.co.uk', 'telegraph.co.uk',
+        'mirror.co.uk', 'express.co.uk', 'dailymail.co.uk', 'thesun.co.uk', 'metro.co.uk', 'eveningstandard.co.uk',
+        'irishtimes.com', 'rte.ie', 'heraldscotland.com', 'scotsman.com', 'thejournal.ie', 'breakingnews.ie',
+        'irishmirror.ie', 'irishnews.com', 'belfasttelegraph.co.uk', 'news.com.au', 'smh.com.au', 'theage.com.au',
+        'theaustralian.com.au', 'afr.com', 'thewest.com.au', 'perthnow.com.au', 'adelaidenow.com.au',
+        'couriermail.com.au', 'heraldsun.com.au', 'dailytelegraph.com.au', 'ntnews.com.au', 'canberratimes.com.au',
+        'themercury.com.au', 'examiner.com.au', 'illawarramercury.com.au', 'newcastleherald.com.au',
+        'sunshinecoastdaily.com.au', 'goldcoastbulletin.com.au', 'thechronicle.com.au', 'northernstar.com.au',
+        'dailyexaminer.com.au', 'dailymercury.com.au', 'themorningbulletin.com.au', 'frasercoastchronicle.com.au',
+        'news-mail.com.au', 'observer.com.au', 'qt.com.au', 'warwickdailynews.com.au', 'westernadvocate.com.au',
+        'westernmagazine.com.au', 'westerntimes.com.au', 'theland.com.au', 'stockandland.com.au',
+        'queenslandcountrylife.com.au', 'northqueenslandregister.com.au', 'farmonline.com.au',
+        'theweeklytimes.com.au', 'countryman.com.au', 'farmweekly.com.au', 'stockjournal.com.au',
+        'theadvocate.com.au', 'mercury.com.au', 'thecourier.com.au', 'ballaratcourier.com.au',
+        'thecouriermail.com.au', 'theherald.com.au', 'theheraldsun.com.au',
+    ], 3),
+    **dict.fromkeys([
+        'factwatchbd.com', 'altnews.in', 'boomlive.in', 'factchecker.in', 'thequint.com', 'factcheck.afp.com',
+        'snopes.com', 'politifact.com', 'fullfact.org', 'factcheck.org',
+    ], 4),
+}
+# Display names that may be stored as the source -> domain
+NAMES = {
+    'the times of india': 'timesofindia.indiatimes.com', 'hindustan times': 'hindustantimes.com',
+    'ndtv': 'ndtv.com', 'the hindu': 'thehindu.com', 'the indian express': 'indianexpress.com',
+    'india today': 'indiatoday.in', 'news18': 'news18.com', 'zee news': 'zeenews.india.com',
+    'aaj tak': 'aajtak.in', 'abp live': 'abplive.com', 'dainik jagran': 'jagran.com',
+    'dainik bhaskar': 'bhaskar.com', 'hindustan': 'livehindustan.com',
+    'business standard': 'business-standard.com', 'the economic times': 'economictimes.indiatimes.com',
+    'mint': 'livemint.com', 'scroll.in': 'scroll.in', 'the wire': 'thewire.in', 'wion': 'wionews.com',
+    'india tv': 'indiatvnews.com', 'news nation': 'newsnationtv.com', 'jansatta': 'jansatta.com',
+    'india.com': 'india.com', 'the daily star': 'thedailystar.net', 'prothom alo': 'prothomalo.com',
+    'dhaka tribune': 'dhakatribune.com', 'new age': 'newagebd.net',
+    'the financial express': 'financialexpress.com.bd', 'the independent': 'theindependentbd.com',
+    'bbc': 'bbc.com', 'reuters': 'reuters.com', 'al jazeera': 'aljazeera.com', 'ap news': 'apnews.com',
+    'cnn': 'cnn.com', 'the new york times': 'nytimes.com', 'the guardian': 'theguardian.com',
+    'france 24': 'france24.com', 'dw': 'dw.com', 'factwatch': 'factwatchbd.com', 'alt news': 'altnews.in',
+    'boom': 'boomlive.in', 'factchecker': 'factchecker.in', 'the quint': 'thequint.com',
+    'afp fact check': 'factcheck.afp.com', 'snopes': 'snopes.com', 'politifact': 'politifact.com',
+    'full fact': 'fullfact.org', 'factcheck.org': 'factcheck.org',
+}
+
+
+def host_of(value):
+    # sources.host_of
+    value = value.strip().lower()
+    if '//' in value:
+        host = urlsplit(value).hostname or ''
+    else:
+        host = value.split('/', 1)[0].rsplit('@', 1)[-1].split(':', 1)[0]
+    host = host.rstrip('.')
+    return host[4:] if host.startswith('www.') else host
+
+
+def lookup(value):
+    # sources.REGISTRY.lookup -> registered domain or None; the longest
+    # registered suffix of the host wins
+    if not value or not host_of(value):
+        return None
+    labels = host_of(value).split('.')
+    for i in range(len(labels)):
+        domain = '.'.join(labels[i:])
+        if domain in DOMAINS:
+            return domain
+    return NAMES.get(value.strip().lower())
+
+
+def upgrade():
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('source_group', sa.SmallInteger(), server_default='0', nullable=False))
+        batch_op.create_index(batch_op.f('ix_article_source_group'), ['source_group'], unique=False)
+
+    # Backfill as `flask reclassify-sources` does: source and source_group
+    # from the stored source, else the URL host; 'Other' when neither is known
+    conn = op.get_bind()
+    article = sa.table('article', sa.column('id', sa.Integer), sa.column('source', sa.String),
+                       sa.column('url', sa.String), sa.column('source_group', sa.SmallInteger),
+                       sa.column('updated_at', sa.DateTime))
+    now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    updates = []
+    for row in conn.execute(sa.select(article.c.id, article.c.source, article.c.url)):
+        registered = lookup(row.source) or lookup(row.url)
+        source = registered or 'Other'
+        group = DOMAINS[registered] if registered else 0
+        if (source, group) != (row.source, 0):
+            updates.append({'row_id': row.id, 'new_source': source, 'group': group, 'now': now})
+    if updates:
+        conn.execute(article.update().where(article.c.id == sa.bindparam('row_id'))
+                     .values(source=sa.bindparam('new_source'), source_group=sa.bindparam('group'),
+                             updated_at=sa.bindparam('now')), updates)
+
+def downgrade():
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_article_source_group'))
+        batch_op.drop_column('source_group')
@@ -0,0 +1,48 @@
+"""Add article_entity index and Article.entities_at
+
+Revision ID: b7e2c9d41f08
+Revises: 3c1d2e4f5a6b
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2c9d41f08'
+down_revision = '3c1d2e4f5a6b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('article_entity',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('article_id', sa.Integer(), nullable=False),
+    sa.Column('text', sa.String(), nullable=False),
+    sa.Column('normalized', sa.String(), nullable=False),
+    sa.Column('label', sa.String(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['article_id'], ['article.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('article_entity', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_article_entity_article_id'), ['article_id'], unique=False)
+        batch_op.create_index('ix_article_entity_normalized_label', ['normalized', 'label'], unique=False)
+
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('entities_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_article_entities_at'), ['entities_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_article_entities_at'))
+        batch_op.drop_column('entities_at')
+
+    with op.batch_alter_table('article_entity', schema=None) as batch_op:
+        batch_op.drop_index('ix_article_entity_normalized_label')
+        batch_op.drop_index(batch_op.f('ix_article_entity_article_id'))
+
+    op.drop_table('article_entity')
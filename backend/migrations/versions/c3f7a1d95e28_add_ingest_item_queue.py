@@ -0,0 +1,43 @@
+"""Add ingest_item queue
+
+Revision ID: c3f7a1d95e28
+Revises: a92c6e1f4b30
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f7a1d95e28'
+down_revision = 'a92c6e1f4b30'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('ingest_item',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('fetch_id', sa.Integer(), nullable=True),
+    sa.Column('url', sa.String(), nullable=True),
+    sa.Column('payload', sa.LargeBinary(), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('available_at', sa.DateTime(), nullable=False),
+    sa.Column('lease_owner', sa.String(length=32), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['fetch_id'], ['exa_fetch.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('ingest_item', schema=None) as batch_op:
+        batch_op.create_index('ix_ingest_item_status_available_at', ['status', 'available_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('ingest_item', schema=None) as batch_op:
+        batch_op.drop_index('ix_ingest_item_status_available_at')
+
+    op.drop_table('ingest_item')
@@ -0,0 +1,57 @@
+"""Add poll_slice and poll_run
+
+Revision ID: d81b4e6f2a73
+Revises: c3f7a1d95e28
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd81b4e6f2a73'
+down_revision = 'c3f7a1d95e28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('poll_run',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('slice', sa.String(length=32), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('results', sa.Integer(), nullable=True),
+    sa.Column('yielded', sa.Integer(), nullable=True),
+    sa.Column('yields', sa.Text(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('poll_run', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_poll_run_started_at'), ['started_at'], unique=False)
+
+    op.create_table('poll_slice',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=32), nullable=False),
+    sa.Column('interval_seconds', sa.Float(), nullable=False),
+    sa.Column('next_run_at', sa.DateTime(), nullable=False),
+    sa.Column('last_run_at', sa.DateTime(), nullable=True),
+    sa.Column('last_yield', sa.Integer(), nullable=True),
+    sa.Column('lease_until', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    with op.batch_alter_table('poll_slice', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_poll_slice_next_run_at'), ['next_run_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('poll_slice', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_poll_slice_next_run_at'))
+
+    op.drop_table('poll_slice')
+    with op.batch_alter_table('poll_run', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_poll_run_started_at'))
+
+    op.drop_table('poll_run')
@@ -0,0 +1,31 @@
+"""Add trend_bucket
+
+Revision ID: e41a7c93d2b5
+Revises: b7e2c9d41f08
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e41a7c93d2b5'
+down_revision = 'b7e2c9d41f08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('trend_bucket',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('start', sa.Integer(), nullable=False),
+    sa.Column('data', sa.LargeBinary(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('start')
+    )
+
+
+def downgrade():
+    op.drop_table('trend_bucket')
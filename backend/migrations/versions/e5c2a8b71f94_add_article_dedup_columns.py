@@ -0,0 +1,67 @@
+"""Add Article canonical_url, simhash, duplicate_of and simhash_band
+
+Revision ID: e5c2a8b71f94
+Revises: d81b4e6f2a73
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5c2a8b71f94'
+down_revision = 'd81b4e6f2a73'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('simhash_band',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('article_id', sa.Integer(), nullable=False),
+    sa.Column('band', sa.SmallInteger(), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['article_id'], ['article.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('simhash_band', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_simhash_band_article_id'), ['article_id'], unique=False)
+        batch_op.create_index('ix_simhash_band_value_band', ['value', 'band'], unique=False)
+
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('canonical_url', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('simhash', sa.BigInteger(), nullable=True))
+        batch_op.add_column(sa.Column('duplicate_of', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_article_canonical_url'), ['canonical_url'], unique=False)
+        batch_op.create_index(batch_op.f('ix_article_duplicate_of'), ['duplicate_of'], unique=False)
+        batch_op.create_foreign_key('fk_article_duplicate_of_article', 'article', ['duplicate_of'], ['id'])
+
+    # Backfill canonical URLs so re-fetched variants of stored articles are
+    # recognized; SimHashes and duplicate links come from
+    # `flask dedup-articles`
+    from dedup import canonical_url
+    conn = op.get_bind()
+    article = sa.table('article', sa.column('id', sa.Integer), sa.column('url', sa.String),
+                       sa.column('canonical_url', sa.String))
+    updates = [{'row_id': row.id, 'key': canonical_url(row.url)}
+               for row in conn.execute(sa.select(article.c.id, article.c.url))]
+    if updates:
+        conn.execute(article.update().where(article.c.id == sa.bindparam('row_id'))
+                     .values(canonical_url=sa.bindparam('key')), updates)
+
+
+def downgrade():
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_article_duplicate_of_article', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_article_duplicate_of'))
+        batch_op.drop_index(batch_op.f('ix_article_canonical_url'))
+        batch_op.drop_column('duplicate_of')
+        batch_op.drop_column('simhash')
+        batch_op.drop_column('canonical_url')
+
+    with op.batch_alter_table('simhash_band', schema=None) as batch_op:
+        batch_op.drop_index('ix_simhash_band_value_band')
+        batch_op.drop_index(batch_op.f('ix_simhash_band_article_id'))
+
+    op.drop_table('simhash_band')
@@ -0,0 +1,48 @@
+"""Add article_link
+
+Revision ID: f0b93d5e7c21
+Revises: e5c2a8b71f94
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f0b93d5e7c21'
+down_revision = 'e5c2a8b71f94'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Filled from Article.extras by `flask rebuild-links`
+    op.create_table('article_link',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('article_id', sa.Integer(), nullable=False),
+    sa.Column('source', sa.String(), nullable=True),
+    sa.Column('url', sa.String(), nullable=False),
+    sa.Column('domain', sa.String(), nullable=False),
+    sa.Column('target_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['article_id'], ['article.id'], ),
+    sa.ForeignKeyConstraint(['target_id'], ['article.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('article_link', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_article_link_article_id'), ['article_id'], unique=False)
+        batch_op.create_index('ix_article_link_domain_article_id', ['domain', 'article_id'], unique=False)
+        batch_op.create_index('ix_article_link_source_domain_article_id', ['source', 'domain', 'article_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_article_link_target_id'), ['target_id'], unique=False)
+        batch_op.create_index('ix_article_link_url_article_id', ['url', 'article_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('article_link', schema=None) as batch_op:
+        batch_op.drop_index('ix_article_link_url_article_id')
+        batch_op.drop_index(batch_op.f('ix_article_link_target_id'))
+        batch_op.drop_index('ix_article_link_source_domain_article_id')
+        batch_op.drop_index('ix_article_link_domain_article_id')
+        batch_op.drop_index(batch_op.f('ix_article_link_article_id'))
+
+    op.drop_table('article_link')
@@ -0,0 +1,239 @@
+import gc
+import hashlib
+import re
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+
+# spaCy is imported and the model loaded only on first use, so CLI commands
+# (`flask db upgrade`, `flask fetch-exa`) and health-checked restarts never
+# pay for it.
+
+# Components the NER-only pipeline drops. In the en_core_web_* "sm" models the
+# ner component carries its own embedded tok2vec, so it works without these.
+NON_NER_COMPONENTS = ['tok2vec', 'tagger', 'parser', 'attribute_ruler', 'lemmatizer', 'senter']
+
+_settings = {'model': 'en_core_web_sm', 'ner_only': True, 'windowed': True, 'token_budget': 256, 'cache_size': 4096}
+_nlp = None
+_nlp_lock = threading.Lock()
+
+
+def configure_nlp(model='en_core_web_sm', ner_only=True, windowed=True, token_budget=256, cache_size=4096):
+    global _nlp
+    with _nlp_lock:
+        if (model, ner_only) != (_settings['model'], _settings['ner_only']):
+            _nlp = None
+        _settings['model'] = model
+        _settings['ner_only'] = ner_only
+        _settings['windowed'] = windowed
+        _settings['token_budget'] = token_budget
+        _settings['cache_size'] = cache_size
+    clear_entity_cache()
+
+
+def _load_nlp():
+    import spacy
+    if _settings['ner_only']:
+        return spacy.load(_settings['model'], exclude=NON_NER_COMPONENTS)
+    return spacy.load(_settings['model'])
+
+
+def get_nlp():
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                _nlp = _load_nlp()
+    return _nlp
+
+
+def nlp_loaded():
+    return _nlp is not None
+
+
+def preload_nlp():
+    # Load the model in the parent process (e.g. gunicorn --preload) so forked
+    # workers share its pages copy-on-write. Freezing moves everything allocated
+    # so far out of the GC's reach, so collections in the workers don't touch
+    # (and thereby copy) the model's objects.
+    model = get_nlp()
+    gc.freeze()
+    return model
+
+
+# --- Batched entity extraction ---
+
+# Entity types the dashboard shows
+ENTITY_LABELS = frozenset(['PERSON', 'ORG', 'GPE', 'LOC', 'PRODUCT', 'EVENT', 'WORK_OF_ART', 'LAW', 'LANGUAGE'])
+
+_space_re = re.compile(r'\s+')
+
+
+def normalize_entity(text):
+    # Grouping key: case/whitespace-insensitive, without a leading "the" or a
+    # trailing possessive ("the BSF's" -> "bsf")
+    norm = _space_re.sub(' ', text).strip().lower()
+    if norm.startswith('the '):
+        norm = norm[4:]
+    if norm.endswith("'s") or norm.endswith("’s"):
+        norm = norm[:-2]
+    return norm.strip(' .,;:"\'')
+
+
+def aggregate_entities(doc):
+    # -> [{'text', 'normalized', 'label', 'count'}] for one spaCy Doc; the
+    # stored surface form is the most frequent one
+    counts = {}
+    for ent in doc.ents:
+        if ent.label_ not in ENTITY_LABELS:
+            continue
+        norm = normalize_entity(ent.text)
+        if not norm:
+            continue
+        key = (norm, ent.label_)
+        entry = counts.get(key)
+        if entry is None:
+            counts[key] = entry = {'forms': Counter(), 'count': 0}
+        entry['forms'][ent.text.strip()] += 1
+        entry['count'] += 1
+    return [{'text': entry['forms'].most_common(1)[0][0], 'normalized': norm, 'label': label, 'count': entry['count']}
+            for (norm, label), entry in counts.items()]
+
+
+# --- Relevance windows ---
+# The dashboard only shows entities from Bangladesh-related passages, and
+# article bodies carry long boilerplate and link lists. In windowed mode a
+# cheap regex pre-pass finds the sentences mentioning Bangladesh (the country,
+# its divisions and districts, and a few unambiguous institutions) and the
+# model runs only on those sentences, their neighbours and the title, capped
+# at NLP_TOKEN_BUDGET words. Text without a mention falls back to its lead.
+# Names common outside Bangladesh are left out (the districts Bhola and
+# Sherpur, the taka) or need context ('Padma' alone is also Padma Shri).
+
+BD_GAZETTEER = [
+    'Bangladesh', 'Bangladeshi', 'Bangladeshis', 'Bangla', 'Dhaka', 'Chittagong', 'Chattogram', 'Barisal',
+    'Barishal', 'Khulna', 'Mymensingh', 'Rajshahi', 'Rangpur', 'Sylhet',
+    'Bagerhat', 'Bandarban', 'Barguna', 'Bogra', 'Bogura', 'Brahmanbaria', 'Chandpur',
+    'Chapai Nawabganj', 'Chapainawabganj', 'Chuadanga', 'Comilla', 'Cumilla', "Cox's Bazar", 'Cox’s Bazar',
+    'Dinajpur', 'Faridpur', 'Feni', 'Gaibandha', 'Gazipur', 'Gopalganj', 'Habiganj', 'Jamalpur', 'Jessore',
+    'Jashore', 'Jhalokati', 'Jhenaidah', 'Joypurhat', 'Khagrachhari', 'Kishoreganj', 'Kurigram', 'Kushtia',
+    'Lakshmipur', 'Lalmonirhat', 'Madaripur', 'Magura', 'Manikganj', 'Meherpur', 'Moulvibazar', 'Munshiganj',
+    'Naogaon', 'Narail', 'Narayanganj', 'Narsingdi', 'Natore', 'Netrokona', 'Nilphamari', 'Noakhali', 'Pabna',
+    'Panchagarh', 'Patuakhali', 'Pirojpur', 'Rajbari', 'Rangamati', 'Satkhira', 'Shariatpur',
+    'Sirajganj', 'Sunamganj', 'Tangail', 'Thakurgaon',
+    'Awami League', 'BNP', 'Jamaat-e-Islami', 'Hasina', 'Yunus', 'BGB', 'Rohingya', 'Teesta',
+    'Padma Bridge', 'Padma Multipurpose Bridge', 'Padma river', 'Sundarbans', 'Benapole', 'Petrapole',
+]
+
+_gazetteer_re = re.compile(r'\b(?:' + '|'.join(re.escape(w) for w in sorted(BD_GAZETTEER, key=len, reverse=True))
+                           + r')\b', re.IGNORECASE)
+_url_re = re.compile(r'https?://\S+|www\.\S+')
+# Sentence ends, and line breaks (titles, list items, captions)
+_sentence_re = re.compile(r'(?<=[.!?])\s+|\s*\n\s*')
+_word_re = re.compile(r'\S+')
+
+
+def relevance_window(text, token_budget=256, context=1):
+    # -> the first line plus the sentences within `context` of a Bangladesh
+    # mention, in document order, at most ~token_budget words
+    sentences = [s for s in _sentence_re.split(_url_re.sub(' ', text or '')) if s.strip()]
+    if not sentences:
+        return ''
+    hits = [i for i, s in enumerate(sentences) if _gazetteer_re.search(s)] or list(range(len(sentences)))
+    lead = _word_re.findall(sentences[0])
+    if len(lead) >= token_budget:
+        # A first "sentence" can be the whole body (no punctuation or breaks)
+        return ' '.join(lead[:token_budget])
+    keep = {0}
+    words = len(lead)
+    for hit in hits:
+        for i in range(max(0, hit - context), min(len(sentences), hit + context + 1)):
+            if i in keep:
+                continue
+            words += len(_word_re.findall(sentences[i]))
+            if words > token_budget:
+                return '\n'.join(sentences[i] for i in sorted(keep))
+            keep.add(i)
+    return '\n'.join(sentences[i] for i in sorted(keep))
+
+
+# --- Entity cache ---
+# Aggregated entities by content hash of the text the model actually sees, so
+# unchanged articles re-read by the dashboard (or syndicated copies of one
+# story) skip the model entirely.
+_entity_cache = OrderedDict()
+_entity_cache_lock = threading.Lock()
+
+
+def clear_entity_cache():
+    with _entity_cache_lock:
+        _entity_cache.clear()
+
+
+def _cache_key(text):
+    return hashlib.blake2b(f"{_settings['model']}\0{text}".encode('utf-8'), digest_size=16).digest()
+
+
+def _cache_get(key):
+    with _entity_cache_lock:
+        entities = _entity_cache.get(key)
+        if entities is not None:
+            _entity_cache.move_to_end(key)
+        return entities
+
+
+def _cache_put(key, entities):
+    with _entity_cache_lock:
+        _entity_cache[key] = entities
+        while len(_entity_cache) > _settings['cache_size']:
+            _entity_cache.popitem(last=False)
+
+
+def extract_entities(texts, batch_size=32, n_process=1, on_doc=None):
+    # Runs NER over many texts with nlp.pipe and yields one aggregated entity
+    # list per input text, in order. Only the ner component runs even when the
+    # full pipeline is loaded; in windowed mode only the relevance window of
+    # each text is processed, and cached results are not recomputed.
+    # on_doc(seconds) is called per document the model processes.
+    model = get_nlp()
+    limit = model.max_length - 1
+    windowed, budget = _settings['windowed'], _settings['token_budget']
+    # Entries are [key, entities]; a repeated text shares its first entry
+    pending = deque()
+    inflight = {}
+
+    def misses():
+        for text in texts:
+            text = (relevance_window(text, budget) if windowed else (text or ''))[:limit]
+            key = _cache_key(text)
+            entry = inflight.get(key)
+            if entry is not None:
+                pending.append(entry)
+                continue
+            entities = _cache_get(key)
+            entry = [key, entities]
+            pending.append(entry)
+            if entities is None:
+                inflight[key] = entry
+                yield text
+
+    def ready():
+        while pending and pending[0][1] is not None:
+            yield pending.popleft()[1]
+
+    disabled = [name for name in model.pipe_names if name != 'ner']
+    with model.select_pipes(disable=disabled):
+        started = time.perf_counter()
+        for doc in model.pipe(misses(), batch_size=batch_size, n_process=n_process):
+            if on_doc is not None:
+                now = time.perf_counter()
+                on_doc(now - started)
+                started = now
+            yield from ready()
+            # The head is now the text this doc came from
+            entry = pending.popleft()
+            entry[1] = aggregate_entities(doc)
+            _cache_put(entry[0], entry[1])
+            del inflight[entry[0]]
+            yield entry[1]
+    yield from ready()
@@ -0,0 +1,49 @@
+import random
+
+from sources import GROUP_BANGLADESHI, GROUP_FACT_CHECK, GROUP_INDIAN, GROUP_INTERNATIONAL, GROUP_NAMES, REGISTRY
+
+# Adaptive Exa polling.
+#
+# The Exa query is split into slices, one per source group, each searching
+# only that group's domains. Every run records its yield (articles new or
+# changed by it) and the slice's interval adapts: halved after a run that
+# found something, doubled after an empty one, within [minimum, maximum]
+# and with random jitter so slices drift apart instead of firing together.
+# A global budget caps Exa calls per rolling day. The app (poll_slice /
+# poll_run tables) does the bookkeeping and guarantees a single running job.
+
+SLICE_GROUPS = (GROUP_INDIAN, GROUP_BANGLADESHI, GROUP_INTERNATIONAL, GROUP_FACT_CHECK)
+SLICES = tuple(GROUP_NAMES[group] for group in SLICE_GROUPS)
+
+SPEEDUP = 0.5
+BACKOFF = 2.0
+
+
+def slice_domains(name):
+    group = SLICE_GROUPS[SLICES.index(name)]
+    return [s.domain for s in REGISTRY.sources(group) if s.exa]
+
+
+def next_interval(interval, yielded, minimum, maximum):
+    if yielded > 0:
+        interval *= SPEEDUP
+    else:
+        interval *= BACKOFF
+    return min(maximum, max(minimum, interval))
+
+
+def jittered(seconds, jitter, rng=random):
+    # seconds * U(1 - jitter, 1 + jitter)
+    return seconds * rng.uniform(1.0 - jitter, 1.0 + jitter)
+
+
+def budget_wait(call_times, budget, window_seconds, now):
+    # call_times: start times (datetimes) of the calls made in the last
+    # window, oldest first. -> seconds until another call fits the budget
+    # (0 when it fits now).
+    if budget <= 0:
+        return window_seconds
+    if len(call_times) < budget:
+        return 0.0
+    frees_at = call_times[len(call_times) - budget]
+    return max(0.0, window_seconds - (now - frees_at).total_seconds())
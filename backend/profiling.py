@@ -0,0 +1,171 @@
+import collections
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+
+# Per-request profiling and SQL timing.
+#
+# Every API request records its SQL statements (count and time per distinct
+# statement) so the slow-request log can name the expensive ones. On top of
+# that a request can opt into a full profile:
+#   sample   - a stack sampler thread; writes collapsed stacks (.folded) that
+#              flamegraph.pl / speedscope / inferno read directly
+#   cprofile - deterministic cProfile; writes a pstats dump (.prof) for
+#              snakeviz / flameprof / gprof2dot
+# In both modes every statement is kept with its offset and duration.
+
+MODES = ('sample', 'cprofile')
+
+_local = threading.local()
+
+
+# --- SQL recording (SQLAlchemy engine events) ---
+
+class SqlLog:
+    def __init__(self, keep_all=False):
+        self.started = time.perf_counter()
+        self.count = 0
+        self.total = 0.0
+        self.by_statement = {}
+        self.statements = [] if keep_all else None
+
+    def add(self, statement, elapsed, started):
+        self.count += 1
+        self.total += elapsed
+        entry = self.by_statement.get(statement)
+        if entry is None:
+            self.by_statement[statement] = [1, elapsed]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed
+        if self.statements is not None:
+            self.statements.append({
+                'offset_ms': round((started - self.started) * 1000, 3),
+                'duration_ms': round(elapsed * 1000, 3),
+                'statement': statement
+            })
+
+    def top(self, n):
+        ranked = sorted(self.by_statement.items(), key=lambda kv: kv[1][1], reverse=True)[:n]
+        return [{'statement': stmt[:300], 'count': count, 'total_ms': round(total * 1000, 3)}
+                for stmt, (count, total) in ranked]
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('sims_query_start', []).append(time.perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('sims_query_start')
+    if not starts:
+        return
+    started = starts.pop()
+    log = getattr(_local, 'sql', None)
+    if log is not None:
+        log.add(statement, time.perf_counter() - started, started)
+
+
+def listen(engine):
+    from sqlalchemy import event
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', after_cursor_execute)
+
+
+# --- Stack sampler ---
+
+class StackSampler:
+    def __init__(self, thread_id, interval=0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})')
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    def folded(self):
+        return '\n'.join(f'{stack} {count}' for stack, count in self.stacks.most_common()) + '\n'
+
+
+# --- Request lifecycle ---
+
+def begin(mode=None, sample_interval=0.005):
+    _local.sql = SqlLog(keep_all=mode in MODES)
+    _local.started = time.perf_counter()
+    _local.mode = mode
+    _local.profiler = None
+    if mode == 'cprofile':
+        _local.profiler = cProfile.Profile()
+        _local.profiler.enable()
+    elif mode == 'sample':
+        _local.profiler = StackSampler(threading.get_ident(), interval=sample_interval)
+        _local.profiler.start()
+
+
+def end():
+    # Returns (elapsed seconds, SqlLog, mode, profiler) and clears the
+    # thread's state; safe to call when begin() never ran.
+    started = getattr(_local, 'started', None)
+    if started is None:
+        return None
+    elapsed = time.perf_counter() - started
+    sql, mode, profiler = _local.sql, _local.mode, _local.profiler
+    if isinstance(profiler, cProfile.Profile):
+        profiler.disable()
+    elif isinstance(profiler, StackSampler):
+        profiler.stop()
+    _local.started = _local.sql = _local.mode = _local.profiler = None
+    return elapsed, sql, mode, profiler
+
+
+def write_profile(directory, name, elapsed, sql, mode, profiler, meta):
+    # Writes <name>.folded or <name>.prof plus <name>.sql.json; returns the
+    # base file name
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, name)
+    if mode == 'cprofile':
+        profiler.dump_stats(base + '.prof')
+    else:
+        with open(base + '.folded', 'w') as f:
+            f.write(profiler.folded())
+    with open(base + '.sql.json', 'w') as f:
+        json.dump({
+            **meta,
+            'mode': mode,
+            'duration_ms': round(elapsed * 1000, 3),
+            'query_count': sql.count,
+            'sql_ms': round(sql.total * 1000, 3),
+            'statements': sql.statements,
+            'top_statements': sql.top(20)
+        }, f, indent=2)
+    return name
+
+
+def slow_request_entry(elapsed, sql, meta, top_n=5):
+    return {
+        **meta,
+        'duration_ms': round(elapsed * 1000, 3),
+        'query_count': sql.count,
+        'sql_ms': round(sql.total * 1000, 3),
+        'top_statements': sql.top(top_n)
+    }
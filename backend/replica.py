@@ -0,0 +1,127 @@
+import datetime
+import os
+import shutil
+import sqlite3
+import threading
+
+# Read replicas served from published SQLite snapshots.
+#
+# The primary copies its database with SQLite's online backup API (a
+# consistent copy while ingestion keeps writing) into a new versioned file
+# in the publish directory, then points the CURRENT file at it with an atomic
+# rename. Published files are never modified again.
+#
+# A replica polls that directory (local or shared). When CURRENT moves it
+# copies the new version to its local directory if that is a different one,
+# checks that it opens, and makes it the file new connections open. Open
+# connections keep reading the previous file until their request returns
+# them, so in-flight requests are not cut off; the previous version is kept
+# on disk for them.
+
+CURRENT = 'CURRENT'
+PREFIX = 'SIMS_Analytics-'
+
+
+def _write_atomic(path, data):
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _versions(directory):
+    # Published files, oldest first (names sort by version)
+    return sorted(name for name in os.listdir(directory) if name.startswith(PREFIX) and name.endswith('.db'))
+
+
+def publish_snapshot(source_path, directory, keep=3):
+    # -> path of the new version. Older versions beyond `keep` are removed.
+    os.makedirs(directory, exist_ok=True)
+    version = datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%dT%H%M%S%fZ')
+    name = f'{PREFIX}{version}.db'
+    tmp = os.path.join(directory, f'.{name}.tmp')
+    source = sqlite3.connect(f'file:{source_path}?mode=ro', uri=True)
+    target = sqlite3.connect(tmp)
+    try:
+        # One step: the copy is a single consistent read of the source
+        source.backup(target)
+        target.execute('PRAGMA journal_mode=DELETE')
+    finally:
+        target.close()
+        source.close()
+    with open(tmp, 'rb') as f:
+        os.fsync(f.fileno())
+    path = os.path.join(directory, name)
+    os.replace(tmp, path)
+    _write_atomic(os.path.join(directory, CURRENT), name)
+    for old in _versions(directory)[:-max(keep, 2)]:
+        try:
+            os.remove(os.path.join(directory, old))
+        except OSError:
+            pass
+    return path
+
+
+def connect_readonly(path):
+    # immutable: published files never change, so SQLite skips locking and
+    # change detection entirely
+    return sqlite3.connect(f'file:{path}?mode=ro&immutable=1', uri=True, check_same_thread=False)
+
+
+class SnapshotReplica:
+    def __init__(self, source_dir, local_dir=None):
+        self.source_dir = source_dir
+        self.local_dir = local_dir or source_dir
+        self.name = None
+        self.path = None
+        self.lock = threading.Lock()
+
+    def published(self):
+        try:
+            with open(os.path.join(self.source_dir, CURRENT)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def connect(self):
+        # SQLAlchemy `creator`: a connection to the current version
+        path = self.path
+        if path is None:
+            raise sqlite3.OperationalError(f"no snapshot published in {self.source_dir} yet")
+        return connect_readonly(path)
+
+    def refresh(self):
+        # -> True when a newer version was installed
+        with self.lock:
+            name = self.published()
+            if name is None or name == self.name:
+                return False
+            path = os.path.join(self.local_dir, name)
+            if self.local_dir != self.source_dir and not os.path.exists(path):
+                os.makedirs(self.local_dir, exist_ok=True)
+                tmp = os.path.join(self.local_dir, f'.{name}.tmp')
+                shutil.copyfile(os.path.join(self.source_dir, name), tmp)
+                os.replace(tmp, path)
+            conn = connect_readonly(path)
+            try:
+                conn.execute('SELECT count(*) FROM sqlite_master').fetchone()
+            finally:
+                conn.close()
+            self.name, self.path = name, path
+            if self.local_dir != self.source_dir:
+                # Keep the previous copy for connections still reading it
+                for old in _versions(self.local_dir)[:-2]:
+                    try:
+                        os.remove(os.path.join(self.local_dir, old))
+                    except OSError:
+                        pass
+            return True
+
+    def version_time(self):
+        # Publication time of the installed version (UTC), or None
+        if self.name is None:
+            return None
+        stamp = self.name[len(PREFIX):-len('.db')]
+        return datetime.datetime.strptime(stamp, '%Y%m%dT%H%M%S%fZ')
@@ -0,0 +1,239 @@
+import datetime
+import threading
+
+import numpy as np
+
+# In-process columnar snapshot of the per-article metadata the dashboard
+# filters and aggregates on. Every column is a compact NumPy array indexed by
+# row, strings are dictionary-encoded into small integer codes, and rows are
+# kept in article id order so an id resolves with a binary search (no per-row
+# Python objects). A permutation by published date turns start/end filters
+# into two binary searches; the remaining filters are boolean masks and
+# aggregations are bincounts.
+#
+# Values that need an article's text (inferred category/sentiment, the
+# dashboard's cross-media verdict) start out PENDING and are filled in by the
+# app for the rows it actually shows.
+
+PENDING = 255
+
+EPOCH = datetime.datetime(1970, 1, 1)
+
+COLUMNS = {
+    'id': np.int32,
+    'published': np.uint32,   # unix seconds (UTC), 0 = unknown
+    'source': np.uint16,
+    'group': np.uint8,        # sources.GROUP_*
+    'category': np.uint8,
+    'sentiment': np.uint8,
+    'language': np.uint8,
+    'fact_check': np.uint8,
+    'mentions': np.bool_,     # title or text mentions Bangladesh
+    'verdict': np.uint8,      # dashboard cross-media verdict
+    'agree': np.uint16,       # ... and its agreeing / contradicting matches
+    'contradict': np.uint16,
+    'coverage': np.uint8,     # bit 0: Bangladeshi match, bit 1: international match
+    'duplicate': np.bool_,    # near duplicate of another article (Article.duplicate_of)
+}
+ENCODED = ('source', 'category', 'sentiment', 'language', 'fact_check', 'verdict')
+
+
+class Dictionary:
+    def __init__(self, limit):
+        self.values = []
+        self.codes = {}
+        self.limit = limit
+
+    def encode(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            if code >= self.limit:
+                raise ValueError(f"dictionary full ({self.limit} values)")
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+    def code(self, value):
+        return self.codes.get(value, -1)
+
+    def decode(self, code):
+        return self.values[code] if code < len(self.values) else None
+
+
+def to_seconds(value):
+    if value is None:
+        return 0
+    if value.tzinfo is not None:
+        value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return max(0, int((value - EPOCH).total_seconds()))
+
+
+class ArticleSnapshot:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.size = 0
+        self.cols = {name: np.zeros(0, dtype) for name, dtype in COLUMNS.items()}
+        self.dicts = {name: Dictionary(PENDING if COLUMNS[name] == np.uint8 else 65535) for name in ENCODED}
+        self.change_seq = None  # article_change.seq the snapshot is current to
+        self._order = None
+        self._rank = None
+        self._by_published = {}
+
+    @property
+    def nbytes(self):
+        size = sum(a[:self.size].nbytes for a in self.cols.values())
+        if self._order is not None:
+            size += self._order.nbytes + self._rank.nbytes
+        return size + sum(a.nbytes for a in self._by_published.values())
+
+    def encode(self, column, value):
+        if value is None and column in ('category', 'sentiment', 'verdict'):
+            return PENDING
+        return self.dicts[column].encode(value)
+
+    def decode(self, column, code):
+        if code == PENDING and column in ('category', 'sentiment', 'verdict'):
+            return None
+        return self.dicts[column].decode(int(code))
+
+    def _grow(self, size):
+        capacity = len(self.cols['id'])
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2, 1024)
+        for name, arr in self.cols.items():
+            grown = np.zeros(capacity, arr.dtype)
+            if name in ('category', 'sentiment', 'verdict'):
+                grown[:] = PENDING
+            grown[:self.size] = arr[:self.size]
+            self.cols[name] = grown
+
+    def positions(self, ids):
+        # article ids -> row numbers (-1 where absent)
+        ids = np.asarray(ids, dtype=COLUMNS['id'])
+        known = self.cols['id'][:self.size]
+        rows = np.searchsorted(known, ids)
+        found = rows < self.size
+        found[found] = known[rows[found]] == ids[found]
+        return np.where(found, rows, -1)
+
+    def appends_in_order(self, ids):
+        # Whether upserting these ids only adds rows above the current
+        # maximum, which keeps existing row numbers stable
+        ids = np.asarray(ids, dtype=np.int64)
+        new = ids[self.positions(ids) < 0]
+        return not (len(new) and self.size and new.min() < self.cols['id'][self.size - 1])
+
+    def upsert(self, columns):
+        # columns: {name: list of values}, all the same length, with 'id'
+        # required (strings for encoded columns, datetimes for published).
+        # Existing ids are overwritten in place; returns the rows written.
+        with self.lock:
+            ids = np.asarray(columns['id'], dtype=np.int64)
+            by_id = np.argsort(ids, kind='stable')
+            ids = ids[by_id]
+            rows = self.positions(ids)
+            new = rows < 0
+            if new.any():
+                # Callers check appends_in_order first (see the app's
+                # analytics_snapshot), so new rows keep the id order
+                if self.size and ids[new][0] < self.cols['id'][self.size - 1]:
+                    raise ValueError("snapshot rows must be added in id order; rebuild it")
+                count = int(new.sum())
+                self._grow(self.size + count)
+                rows[new] = np.arange(self.size, self.size + count)
+                self.size += count
+            for name, values in columns.items():
+                values = [values[i] for i in by_id]
+                if name in ENCODED:
+                    values = [self.encode(name, v) for v in values]
+                elif name == 'published':
+                    values = [to_seconds(v) for v in values]
+                self.cols[name][rows] = np.asarray(values, dtype=COLUMNS[name])
+            self._order = None
+            self._by_published = {}
+            return rows
+
+    def set_codes(self, column, rows, values):
+        with self.lock:
+            codes = np.asarray([self.encode(column, v) for v in values], dtype=COLUMNS[column])
+            self.cols[column][rows] = codes
+            if column in self._by_published:
+                self._by_published[column][self._rank[rows]] = codes
+
+    def _published_order(self):
+        if self._order is None:
+            published = self.cols['published'][:self.size]
+            self._order = np.argsort(published, kind='stable').astype(np.int32)
+            self._rank = np.empty_like(self._order)
+            self._rank[self._order] = np.arange(self.size, dtype=np.int32)
+            self._by_published = {'published': published[self._order]}
+        return self._order
+
+    def by_published(self, column):
+        # Copy of a column in published order, made on first use, so date
+        # slices and filters over it are contiguous scans rather than
+        # gathers through the permutation
+        order = self._published_order()
+        if column not in self._by_published:
+            self._by_published[column] = self.cols[column][:self.size][order]
+        return self._by_published[column]
+
+    def latest(self, limit, start=None, end=None, **equals):
+        # Rows with start <= published < end (datetimes) and column == code
+        # for every keyword, newest first, at most `limit`. The date range is
+        # a slice of the published order; the equality masks run over it in
+        # growing chunks from the newest end, so a typical dashboard query
+        # only looks at a few thousand rows.
+        with self.lock:
+            order = self._published_order()
+            published = self.by_published('published')
+            lo, hi = 0, self.size
+            # (bounds are cast to the column's dtype; a Python int would make
+            # searchsorted convert the whole array first)
+            bound = COLUMNS['published']
+            if start is not None or end is not None:
+                # SQL comparisons exclude unknown dates
+                lo = int(np.searchsorted(published, bound(1)))
+            if start is not None:
+                lo = max(lo, int(np.searchsorted(published, bound(to_seconds(start)))))
+            if end is not None:
+                hi = min(hi, int(np.searchsorted(published, bound(to_seconds(end)))))
+            columns = {}
+            for column, value in equals.items():
+                if value is None:
+                    continue
+                if column in ENCODED and isinstance(value, str):
+                    value = self.dicts[column].code(value)
+                    if value < 0:
+                        return np.zeros(0, np.int64)
+                columns[column] = (self.by_published(column), value)
+            found = []
+            count = 0
+            chunk = max(1024, limit * 8)
+            pos = hi
+            while pos > lo and count < limit:
+                begin = max(lo, pos - chunk)
+                mask = np.ones(pos - begin, dtype=bool)
+                for values, code in columns.values():
+                    mask &= values[begin:pos] == code
+                hits = order[begin:pos][mask][::-1]
+                found.append(hits)
+                count += len(hits)
+                pos = begin
+                chunk *= 4
+            if not found:
+                return np.zeros(0, np.int64)
+            return np.concatenate(found)[:limit].astype(np.int64)
+
+    def counts(self, column, rows):
+        # {decoded value: count} over the given rows, via bincount
+        codes = self.cols[column][rows]
+        if not len(codes):
+            return {}
+        tally = np.bincount(codes)
+        return {self.decode(column, code): int(n) for code, n in enumerate(tally) if n}
+
+    def values(self, column, rows):
+        return [self.decode(column, code) for code in self.cols[column][rows]]
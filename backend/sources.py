@@ -0,0 +1,227 @@
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+# Source registry: every outlet the app knows about, with its group, display
+# name and language. Ingestion, the dashboard, trends and /api/indian-sources
+# all classify through the one REGISTRY below.
+#
+# Lookups go through a trie of reversed domain labels
+# (com -> ndtv -> {entry}), so "m.ndtv.com" or "epaper.thehindu.com" resolve
+# to the registered domain in O(number of labels), and the longest
+# registered suffix wins ("economictimes.indiatimes.com" over a bare
+# "indiatimes.com").
+#
+# Article.source_group stores the group id, so SQL filters compare one
+# indexed integer instead of IN-lists of domains. Run
+# `flask reclassify-sources` after changing this file.
+
+GROUP_OTHER = 0
+GROUP_INDIAN = 1
+GROUP_BANGLADESHI = 2
+GROUP_INTERNATIONAL = 3
+GROUP_FACT_CHECK = 4
+
+GROUP_NAMES = {
+    GROUP_OTHER: 'other',
+    GROUP_INDIAN: 'indian',
+    GROUP_BANGLADESHI: 'bangladeshi',
+    GROUP_INTERNATIONAL: 'international',
+    GROUP_FACT_CHECK: 'fact_check',
+}
+
+Source = namedtuple('Source', ['domain', 'group', 'name', 'language', 'exa'])
+
+# (domain, display name, language). The Indian outlets are what the app
+# monitors; their order is the order /api/indian-sources returns.
+INDIAN = [
+    ("timesofindia.indiatimes.com", "The Times of India", "English"),
+    ("hindustantimes.com", "Hindustan Times", "English"),
+    ("ndtv.com", "NDTV", "English"),
+    ("thehindu.com", "The Hindu", "English"),
+    ("indianexpress.com", "The Indian Express", "English"),
+    ("indiatoday.in", "India Today", "English"),
+    ("news18.com", "News18", "English"),
+    ("zeenews.india.com", "Zee News", "Hindi"),
+    ("aajtak.in", "Aaj Tak", "Hindi"),
+    ("abplive.com", "ABP Live", "Hindi"),
+    ("jagran.com", "Dainik Jagran", "Hindi"),
+    ("bhaskar.com", "Dainik Bhaskar", "Hindi"),
+    ("livehindustan.com", "Hindustan", "Hindi"),
+    ("business-standard.com", "Business Standard", "English"),
+    ("economictimes.indiatimes.com", "The Economic Times", "English"),
+    ("livemint.com", "Mint", "English"),
+    ("scroll.in", "Scroll.in", "English"),
+    ("thewire.in", "The Wire", "English"),
+    ("wionews.com", "WION", "English"),
+    ("indiatvnews.com", "India TV", "Hindi"),
+    ("newsnationtv.com", "News Nation", "Hindi"),
+    ("jansatta.com", "Jansatta", "Hindi"),
+    ("india.com", "India.com", "English"),
+]
+
+# Bangladeshi and international outlets queried in the Exa search (their
+# coverage is what Indian stories are compared against)
+BANGLADESHI = [
+    ("bdnews24.com", "bdnews24.com", "English"),
+    ("thedailystar.net", "The Daily Star", "English"),
+    ("prothomalo.com", "Prothom Alo", "Bengali"),
+    ("dhakatribune.com", "Dhaka Tribune", "English"),
+    ("newagebd.net", "New Age", "English"),
+    ("financialexpress.com.bd", "The Financial Express", "English"),
+    ("theindependentbd.com", "The Independent", "English"),
+]
+INTERNATIONAL = [
+    ("bbc.com", "BBC", "English"),
+    ("reuters.com", "Reuters", "English"),
+    ("aljazeera.com", "Al Jazeera", "English"),
+    ("apnews.com", "AP News", "English"),
+    ("cnn.com", "CNN", "English"),
+    ("nytimes.com", "The New York Times", "English"),
+    ("theguardian.com", "The Guardian", "English"),
+    ("france24.com", "France 24", "English"),
+    ("dw.com", "DW", "English"),
+]
+FACT_CHECK = [
+    ("factwatchbd.com", "FactWatch", "English"),
+    ("altnews.in", "Alt News", "English"),
+    ("boomlive.in", "BOOM", "English"),
+    ("factchecker.in", "FactChecker", "English"),
+    ("thequint.com", "The Quint", "English"),
+    ("factcheck.afp.com", "AFP Fact Check", "English"),
+    ("snopes.com", "Snopes", "English"),
+    ("politifact.com", "PolitiFact", "English"),
+    ("fullfact.org", "Full Fact", "English"),
+    ("factcheck.org", "FactCheck.org", "English"),
+]
+
+# Recognized when classifying (dashboard cross-media matching) but not part
+# of the Exa query
+BANGLADESHI_EXTRA = [
+    'tbsnews.net', 'jugantor.com', 'kalerkantho.com', 'banglatribune.com', 'manabzamin.com', 'bssnews.net',
+    'observerbd.com', 'daily-sun.com', 'dailyjanakantha.com', 'thefinancialexpress.com.bd', 'unb.com.bd',
+    'risingbd.com', 'bangladeshpost.net', 'daily-bangladesh.com', 'bhorerkagoj.com', 'dailyinqilab.com',
+    'samakal.com', 'ittefaq.com.bd', 'amardesh.com', 'dailynayadiganta.com', 'dailysangram.com',
+    'dailyprotidinersangbad.com', 'dailyvorerpata.com', 'dailyshomoyeralo.com', 'dailyamadershomoy.com',
+    'dailykalerkantho.com', 'dailysangbad.com', 'dailysun.com', 'dailyasianage.com', 'dailyobserverbd.com',
+    'dailynewnation.com', 'dailyindependentbd.com', 'dailyjanata.com', 'dailyjagaran.com', 'jagonews24.com',
+]
+INTERNATIONAL_EXTRA = [
+    'washingtonpost.com', 'abc.net.au', 'cbc.ca', 'cbsnews.com', 'nbcnews.com', 'foxnews.com', 'sky.com',
+    'japantimes.co.jp', 'straitstimes.com', 'channelnewsasia.com', 'scmp.com', 'gulfnews.com', 'arabnews.com',
+    'rt.com', 'tass.com', 'sputniknews.com', 'chinadaily.com.cn', 'globaltimes.cn', 'lemonde.fr', 'spiegel.de',
+    'elpais.com', 'corriere.it', 'lefigaro.fr', 'asahi.com', 'mainichi.jp', 'yomiuri.co.jp', 'koreatimes.co.kr',
+    'joongang.co.kr', 'hankyoreh.com', 'latimes.com', 'usatoday.com', 'bloomberg.com', 'forbes.com', 'wsj.com',
+    'economist.com', 'ft.com', 'npr.org', 'voanews.com', 'rferl.org', 'cna.com.tw', 'thetimes.co.uk',
+    'independent.co.uk', 'telegraph.co.uk', 'mirror.co.uk', 'express.co.uk', 'dailymail.co.uk', 'thesun.co.uk',
+    'metro.co.uk', 'eveningstandard.co.uk', 'irishtimes.com', 'rte.ie', 'heraldscotland.com', 'scotsman.com',
+    'thejournal.ie', 'breakingnews.ie', 'irishmirror.ie', 'irishnews.com', 'belfasttelegraph.co.uk',
+    'news.com.au', 'smh.com.au', 'theage.com.au', 'theaustralian.com.au', 'afr.com', 'thewest.com.au',
+    'perthnow.com.au', 'adelaidenow.com.au', 'couriermail.com.au', 'heraldsun.com.au', 'dailytelegraph.com.au',
+    'ntnews.com.au', 'canberratimes.com.au', 'themercury.com.au', 'examiner.com.au', 'illawarramercury.com.au',
+    'newcastleherald.com.au', 'sunshinecoastdaily.com.au', 'goldcoastbulletin.com.au', 'thechronicle.com.au',
+    'northernstar.com.au', 'dailyexaminer.com.au', 'dailymercury.com.au', 'themorningbulletin.com.au',
+    'frasercoastchronicle.com.au', 'news-mail.com.au', 'observer.com.au', 'qt.com.au',
+    'warwickdailynews.com.au', 'westernadvocate.com.au', 'westernmagazine.com.au', 'westerntimes.com.au',
+    'theland.com.au', 'stockandland.com.au', 'queenslandcountrylife.com.au', 'northqueenslandregister.com.au',
+    'farmonline.com.au', 'theweeklytimes.com.au', 'countryman.com.au', 'farmweekly.com.au', 'stockjournal.com.au',
+    'theadvocate.com.au', 'mercury.com.au', 'thecourier.com.au', 'ballaratcourier.com.au',
+    'thecouriermail.com.au', 'theherald.com.au', 'theheraldsun.com.au',
+]
+
+_LEAF = None  # trie key holding the Source registered at that node (labels are strings)
+
+
+def host_of(value):
+    # URL or bare host -> lowercase host without port, credentials, "www."
+    # or trailing dot; '' when there is none
+    if not value:
+        return ''
+    value = value.strip().lower()
+    if '//' in value:
+        host = urlsplit(value).hostname or ''
+    else:
+        host = value.split('/', 1)[0].rsplit('@', 1)[-1].split(':', 1)[0]
+    host = host.rstrip('.')
+    if host.startswith('www.'):
+        host = host[4:]
+    return host
+
+
+class SourceRegistry:
+    def __init__(self):
+        self._trie = {}
+        self._by_name = {}
+        self._sources = []
+
+    def add(self, domain, group, name=None, language=None, exa=False):
+        domain = host_of(domain)
+        node = self._trie
+        for label in reversed(domain.split('.')):
+            node = node.setdefault(label, {})
+        existing = node.get(_LEAF)
+        if existing is not None:
+            if existing.group != group:
+                raise ValueError(f"{domain} is registered as both {GROUP_NAMES[existing.group]} "
+                                 f"and {GROUP_NAMES[group]}")
+            return existing
+        source = Source(domain, group, name or domain, language, exa)
+        node[_LEAF] = source
+        self._sources.append(source)
+        if name:
+            self._by_name.setdefault(name.lower(), source)
+        return source
+
+    def lookup(self, value):
+        # URL, host, registered domain or display name -> Source or None
+        host = host_of(value)
+        if not host:
+            return None
+        node = self._trie
+        found = None
+        for label in reversed(host.split('.')):
+            node = node.get(label)
+            if node is None:
+                break
+            found = node.get(_LEAF, found)
+        if found is None:
+            found = self._by_name.get(value.strip().lower())
+        return found
+
+    def classify_many(self, values):
+        # Same as [lookup(v) for v in values]; hosts repeat a lot in a batch,
+        # so each distinct value is resolved once
+        memo = {}
+        result = []
+        for value in values:
+            if value not in memo:
+                memo[value] = self.lookup(value)
+            result.append(memo[value])
+        return result
+
+    def group_of(self, value):
+        source = self.lookup(value)
+        return source.group if source else GROUP_OTHER
+
+    def sources(self, group=None):
+        return [s for s in self._sources if group is None or s.group == group]
+
+    def domains(self, group=None):
+        return [s.domain for s in self.sources(group)]
+
+    def exa_domains(self):
+        return [s.domain for s in self._sources if s.exa]
+
+
+def build_registry():
+    registry = SourceRegistry()
+    for group, entries in ((GROUP_INDIAN, INDIAN), (GROUP_BANGLADESHI, BANGLADESHI),
+                           (GROUP_INTERNATIONAL, INTERNATIONAL), (GROUP_FACT_CHECK, FACT_CHECK)):
+        for domain, name, language in entries:
+            registry.add(domain, group, name, language, exa=True)
+    for group, domains in ((GROUP_BANGLADESHI, BANGLADESHI_EXTRA), (GROUP_INTERNATIONAL, INTERNATIONAL_EXTRA)):
+        for domain in domains:
+            registry.add(domain, group)
+    return registry
+
+
+REGISTRY = build_registry()
@@ -0,0 +1,17 @@
+import threading
+
+import metrics
+
+
+def test_shards_of_finished_threads_are_retired():
+    # Threaded servers run each request on a new thread: their shards must be
+    # folded into the totals, not kept one per thread ever seen
+    counter = metrics.Counter('test_retired_total', 'Test counter', ['kind'])
+    for _ in range(200):
+        thread = threading.Thread(target=counter.labels('a').inc)
+        thread.start()
+        thread.join()
+    counter.labels('a').inc()
+    child = counter.labels('a')
+    assert child.get() == 201
+    assert len(child._values._shards) == 1
@@ -0,0 +1,39 @@
+import app as A
+from bench.corpus import create_corpus
+
+
+def read_until(chunks, marker, limit=20):
+    # -> the chunks read up to and including the first containing marker
+    seen = []
+    for chunk in chunks:
+        chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+        seen.append(chunk)
+        if marker in chunk or len(seen) >= limit:
+            break
+    return seen
+
+
+def test_resumed_stream_receives_live_events(tmp_path):
+    # A client resuming with Last-Event-ID is replayed the changes it missed
+    # (event ids are article_change seqs) and must then keep following the
+    # broker from where it was when the client connected
+    app = create_corpus(str(tmp_path / 'stream.db'), 20, force=True)
+    app.config['STREAM_HEARTBEAT_SECONDS'] = 0.1
+    with app.app_context():
+        ids = [a.id for a in A.Article.query.order_by(A.Article.id).limit(8)]
+        A.record_changes([(article_id, 'updated', ['title']) for article_id in ids])
+        A.db.session.commit()
+        latest = A.latest_change_seq()
+
+    response = app.test_client().get('/api/stream', headers={'Last-Event-ID': str(latest - 3)}, buffered=False)
+    try:
+        chunks = iter(response.response)
+        backfill = read_until(chunks, 'event: counters')
+        assert [c.split('\n', 1)[0] for c in backfill if c.startswith('id:')] == \
+            [f'id: {seq}' for seq in range(latest - 2, latest + 1)]
+
+        A.broker.publish([(latest + 1, 'article', {'id': ids[0]})])
+        live = read_until(chunks, f'id: {latest + 1}')
+        assert any(c.startswith(f'id: {latest + 1}\n') for c in live)
+    finally:
+        response.close()
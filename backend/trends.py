@@ -0,0 +1,154 @@
+import datetime
+import hashlib
+import json
+import math
+import struct
+import zlib
+from array import array
+
+# Bounded-memory trending detection.
+#
+# Mentions are counted per time bucket in a Count-Min sketch (frequency
+# estimates for any key in fixed space) plus a Space-Saving summary (which
+# keys are the heavy hitters). A bucket's size depends only on the sketch
+# parameters, never on how many articles or distinct entities went in, and
+# only a fixed number of buckets is retained.
+#
+# Keys are opaque strings; callers use "<normalized entity>|<label>".
+
+
+class CountMinSketch:
+    def __init__(self, width=2048, depth=4, table=None):
+        self.width = width
+        self.depth = depth
+        self.table = table if table is not None else array('I', bytes(4 * width * depth))
+
+    def _indexes(self, key):
+        # Kirsch-Mitzenmacher double hashing from one stable 128-bit digest
+        # (Python's hash() is salted per process, and buckets are shared
+        # between processes)
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        width = self.width
+        return [row * width + (h1 + row * h2) % width for row in range(self.depth)]
+
+    def add(self, key, n=1):
+        table = self.table
+        for i in self._indexes(key):
+            table[i] += n
+
+    def estimate(self, key):
+        table = self.table
+        return min(table[i] for i in self._indexes(key))
+
+
+class SpaceSaving:
+    def __init__(self, capacity=200, counts=None):
+        self.capacity = capacity
+        # key -> [count, overestimation error]
+        self.counts = counts if counts is not None else {}
+
+    def add(self, key, n=1):
+        entry = self.counts.get(key)
+        if entry is not None:
+            entry[0] += n
+            return
+        if len(self.counts) < self.capacity:
+            self.counts[key] = [n, 0]
+            return
+        # Replace the current minimum; the newcomer inherits its count as error
+        victim = min(self.counts, key=lambda k: self.counts[k][0])
+        floor = self.counts.pop(victim)[0]
+        self.counts[key] = [floor + n, floor]
+
+    def keys(self):
+        return self.counts.keys()
+
+    def top(self, n):
+        return sorted(self.counts.items(), key=lambda kv: kv[1][0], reverse=True)[:n]
+
+
+class TrendBucket:
+    _header = struct.Struct('<IIII')  # width, depth, capacity, len(cms bytes)
+
+    def __init__(self, width=2048, depth=4, capacity=200, cms=None, heavy=None):
+        self.cms = cms or CountMinSketch(width, depth)
+        self.heavy = heavy or SpaceSaving(capacity)
+
+    def add(self, key, n=1):
+        self.cms.add(key, n)
+        self.heavy.add(key, n)
+
+    def estimate(self, key):
+        return self.cms.estimate(key)
+
+    def to_bytes(self):
+        cms = self.cms.table.tobytes()
+        heavy = json.dumps(self.heavy.counts, separators=(',', ':')).encode('utf-8')
+        header = self._header.pack(self.cms.width, self.cms.depth, self.heavy.capacity, len(cms))
+        return zlib.compress(header + cms + heavy, 6)
+
+    @classmethod
+    def from_bytes(cls, blob):
+        raw = zlib.decompress(blob)
+        width, depth, capacity, cms_len = cls._header.unpack_from(raw)
+        offset = cls._header.size
+        table = array('I')
+        table.frombytes(raw[offset:offset + cms_len])
+        counts = json.loads(raw[offset + cms_len:].decode('utf-8'))
+        return cls(cms=CountMinSketch(width, depth, table), heavy=SpaceSaving(capacity, counts))
+
+
+def bucket_start(ts, bucket_seconds):
+    # Naive datetimes are UTC throughout the app
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    epoch = int((ts - datetime.datetime(1970, 1, 1)).total_seconds())
+    return epoch - epoch % bucket_seconds
+
+
+def burst_scores(window_buckets, baseline_buckets, window_seconds, baseline_seconds, limit=20, key_filter=None):
+    # Candidates are the heavy hitters of the current window; their counts
+    # come from the Count-Min sketches of every bucket involved. The baseline
+    # is rescaled to the window's length and the score is a Poisson-style
+    # z-score, (observed - expected) / sqrt(expected + 1), so entities with a
+    # long steady history rank below genuine surges.
+    candidates = set()
+    for bucket in window_buckets:
+        candidates.update(bucket.heavy.keys())
+    if key_filter is not None:
+        candidates = {k for k in candidates if key_filter(k)}
+    scale = window_seconds / baseline_seconds if baseline_seconds else 0.0
+    scored = []
+    for key in candidates:
+        current = sum(b.estimate(key) for b in window_buckets)
+        if current == 0:
+            continue
+        baseline = sum(b.estimate(key) for b in baseline_buckets)
+        expected = baseline * scale
+        score = (current - expected) / math.sqrt(expected + 1.0)
+        scored.append({
+            'key': key,
+            'current': current,
+            'baseline': baseline,
+            'expected': round(expected, 3),
+            'ratio': round((current + 1.0) / (expected + 1.0), 3),
+            'burst': round(score, 3)
+        })
+    scored.sort(key=lambda s: (s['burst'], s['current']), reverse=True)
+    return scored[:limit]
+
+
+def parse_duration(value, default_seconds):
+    # "90m", "6h", "7d", "2w" or plain seconds
+    if not value:
+        return default_seconds
+    value = value.strip().lower()
+    units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+    try:
+        if value[-1] in units:
+            return int(float(value[:-1]) * units[value[-1]])
+        return int(value)
+    except (ValueError, IndexError):
+        return default_seconds
@@ -1,6 +1,6 @@
 "use client"
 
-import { useState, useEffect, useMemo } from "react";
+import { useState, useEffect, useMemo, useRef } from "react";
 import axios from "axios";
 import { format } from "date-fns";
 import { Line, Pie, Bar } from "react-chartjs-2";
@@ -160,6 +160,32 @@ export default function Dashboard() {
     // eslint-disable-next-line
   }, []);
 
+  // Refetch when the backend streams new or updated articles instead of polling
+  const fetchDashboardRef = useRef(fetchDashboard);
+  fetchDashboardRef.current = fetchDashboard;
+  useEffect(() => {
+    const events = new EventSource("/api/stream");
+    let timer: ReturnType<typeof setTimeout> | undefined;
+    let initial = true;
+    const refresh = () => {
+      clearTimeout(timer);
+      timer = setTimeout(() => fetchDashboardRef.current(), 2000);
+    };
+    events.addEventListener("counters", () => {
+      // The first counters event only describes the current state
+      if (initial) {
+        initial = false;
+        return;
+      }
+      refresh();
+    });
+    events.addEventListener("reset", refresh);
+    return () => {
+      clearTimeout(timer);
+      events.close();
+    };
+  }, []);
+
   // Table sorting
   const handleSort = (col: string) => {
     if (sortBy === col) {